@@ -5,3 +5,7 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'Настройка API'
+
+    def ready(self):
+        import api.signals  # noqa: F401
+        import api.sqlite  # noqa: F401
@@ -0,0 +1,157 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from reviews.fields import PREFIX_UPPER_BOUND, normalize_search_key
+from reviews.models import Review, TableVersion, Title
+
+
+class TitleAutocompleteIndex:
+    """Префиксный индекс названий произведений в памяти процесса.
+
+    Для каждого слова названия хранится ключ от начала этого слова до конца
+    названия, поэтому запрос совпадает с началом любого слова. Ключи лежат
+    в отсортированном списке: все продолжения префикса образуют непрерывный
+    диапазон, который находится двоичным поиском. Индекс обновляется
+    сигналами при изменении произведений и отзывов в этом процессе. Раз в
+    `check_interval` секунд он сверяет версии таблиц произведений и отзывов
+    в БД (`reviews.TableVersion`) и целиком перечитывается при их смене,
+    чтобы подхватить изменения других процессов, и не реже раза в `ttl`
+    секунд.
+    """
+
+    # Рейтинг произведения меняется вместе с таблицей отзывов.
+    versioned_models = (Title, Review)
+
+    def __init__(self, ttl=300, check_interval=1):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.versions = None
+        self.loaded_at = None
+        self.checked_at = None
+        self.keys = []
+        self.titles = {}
+
+    @staticmethod
+    def get_keys(name):
+        key = normalize_search_key(name)
+        words = key.split(' ')
+        return {
+            ' '.join(words[position:]) for position in range(len(words))
+        }
+
+    @staticmethod
+    def get_score(rating, rating_count):
+        return (rating if rating is not None else -1, rating_count)
+
+    def load(self):
+        with self.lock:
+            # Версии читаются до строк: запись между запросами только
+            # вызовет лишнее перечитывание при следующей проверке.
+            versions = TableVersion.objects.get_versions(
+                self.versioned_models
+            )
+            self.keys = []
+            self.titles = {}
+            rows = Title.objects.values_list(
+                'id', 'name', 'rating', 'rating_count'
+            )
+            for pk, name, rating, rating_count in rows.iterator():
+                self.titles[pk] = (name, rating, rating_count)
+                self.keys.extend((key, pk) for key in self.get_keys(name))
+            self.keys.sort()
+            self.versions = versions
+            self.loaded_at = self.checked_at = time.monotonic()
+
+    def is_stale(self):
+        """Истёк ли `ttl` или изменилась версия таблиц в БД."""
+        now = time.monotonic()
+        if self.loaded_at is None or now - self.loaded_at > self.ttl:
+            return True
+        if now - self.checked_at < self.check_interval:
+            return False
+        self.checked_at = now
+        return TableVersion.objects.get_versions(
+            self.versioned_models
+        ) != self.versions
+
+    def ensure_loaded(self):
+        if self.is_stale():
+            self.load()
+
+    def clear(self):
+        with self.lock:
+            self.loaded_at = None
+            self.keys = []
+            self.titles = {}
+
+    def add(self, pk, name, rating, rating_count):
+        with self.lock:
+            if self.loaded_at is None:
+                return
+            self.discard(pk)
+            self.titles[pk] = (name, rating, rating_count)
+            for key in self.get_keys(name):
+                insort(self.keys, (key, pk))
+
+    def add_many(self, rows):
+        """Добавляет строки (id, название, рейтинг, число оценок).
+
+        Ключи всех строк дописываются в конец списка, который затем
+        сортируется один раз, а не вставляются по одному.
+        """
+        with self.lock:
+            if self.loaded_at is None:
+                return
+            rows = list(rows)
+            for row in rows:
+                self.discard(row[0])
+            for pk, name, rating, rating_count in rows:
+                self.titles[pk] = (name, rating, rating_count)
+                self.keys.extend((key, pk) for key in self.get_keys(name))
+            self.keys.sort()
+
+    def discard(self, pk):
+        with self.lock:
+            if self.loaded_at is None or pk not in self.titles:
+                return
+            name = self.titles.pop(pk)[0]
+            for key in self.get_keys(name):
+                position = bisect_left(self.keys, (key, pk))
+                if self.keys[position:position + 1] == [(key, pk)]:
+                    del self.keys[position]
+
+    def refresh(self, pk):
+        """Перечитывает из БД одно произведение, например после отзыва."""
+        if self.loaded_at is None:
+            return
+        row = Title.objects.filter(pk=pk).values_list(
+            'name', 'rating', 'rating_count'
+        ).first()
+        if row is None:
+            self.discard(pk)
+        else:
+            self.add(pk, *row)
+
+    def search(self, query, limit=10):
+        """Возвращает до `limit` произведений с наибольшим рейтингом."""
+        prefix = normalize_search_key(query)
+        if not prefix:
+            return []
+        self.ensure_loaded()
+        with self.lock:
+            start = bisect_left(self.keys, (prefix,))
+            end = bisect_left(self.keys, (prefix + PREFIX_UPPER_BOUND,))
+            found = {pk for _, pk in self.keys[start:end]}
+            titles = self.titles
+            best = heapq.nlargest(
+                limit,
+                found,
+                key=lambda pk: (self.get_score(*titles[pk][1:]), -pk)
+            )
+            return [(pk, *titles[pk]) for pk in best]
+
+
+title_autocomplete_index = TitleAutocompleteIndex()
@@ -0,0 +1,36 @@
+"""Кэш ответов на анонимные GET-запросы к каталогу.
+
+Ключ ответа включает версии моделей, от которых он зависит. Версии
+хранятся в БД (`reviews.TableVersion`), и запись в модель увеличивает её
+версию, поэтому старые ответы перестают использоваться во всех процессах
+сразу, даже если каждый хранит ответы в своей памяти. Устаревшие ответы
+затем вытесняются бэкендом кэша (LRU) или по TTL.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from reviews.models import TableVersion
+
+RESPONSE_KEY = 'api:response:{}'
+
+
+def get_cache():
+    return caches[settings.API_CACHE['ALIAS']]
+
+
+def get_response_key(request, models):
+    """Ключ по адресу, отсортированной строке запроса, Accept и версиям.
+
+    Схема и хост входят в ключ: ответ содержит абсолютные ссылки.
+    """
+    query = sorted(request.GET.lists())
+    parts = (
+        request.build_absolute_uri(request.path),
+        repr(query),
+        request.META.get('HTTP_ACCEPT', ''),
+        repr(TableVersion.objects.get_versions(models)),
+    )
+    digest = hashlib.md5('\n'.join(parts).encode()).hexdigest()
+    return RESPONSE_KEY.format(digest)
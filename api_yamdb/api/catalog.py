@@ -0,0 +1,276 @@
+"""Колоночный движок чтения каталога произведений в памяти процесса.
+
+Хранит столбцы произведений в массивах NumPy и битовые маски жанров,
+поэтому фильтрация, сортировка и разбиение на страницы выполняются
+векторными операциями, а из БД выбирается только итоговая страница.
+Изменения в этом процессе применяются инкрементально по сигналам. Раз в
+`check_interval` секунд движок сверяет версии таблиц каталога в БД
+(`reviews.TableVersion`) и при их смене, то есть после записи в любом
+процессе, перезагружается полностью, как и раз в `ttl` секунд.
+Если NumPy не установлен, движок недоступен и используется ORM. NumPy
+импортируется при первом обращении к движку, а не при запуске процесса.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from reviews.fields import PREFIX_UPPER_BOUND, normalize_search_key
+from reviews.models import (Category, Genre, Review, TableVersion, Title,
+                            TitleGenre)
+
+np = None
+
+
+def import_numpy():
+    """Импортирует NumPy и возвращает False, если он не установлен."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            return False
+        np = numpy
+    return True
+
+
+class CatalogEngine:
+    """Фильтрует и сортирует каталог так же, как `TitleFilter` и ORM."""
+
+    supported_params = frozenset(
+        ('category', 'genre', 'year', 'name', 'ordering', 'page')
+    )
+    ordering_fields = ('id', 'year', 'rating')
+    # Рейтинг произведения меняется вместе с таблицей отзывов.
+    versioned_models = (Category, Genre, Title, TitleGenre, Review)
+
+    def __init__(self, ttl=300, check_interval=1):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.versions = None
+        self.loaded_at = None
+        self.checked_at = None
+        self.dirty = set()
+
+    @property
+    def available(self):
+        return import_numpy()
+
+    def clear(self):
+        with self.lock:
+            self.loaded_at = None
+            self.dirty = set()
+
+    def mark_dirty(self, title_id):
+        with self.lock:
+            if self.loaded_at is not None:
+                self.dirty.add(title_id)
+
+    def load(self):
+        import_numpy()
+        with self.lock:
+            # Версии читаются до строк: запись между запросами только
+            # вызовет лишнюю перезагрузку при следующей проверке.
+            versions = TableVersion.objects.get_versions(
+                self.versioned_models
+            )
+            rows = list(
+                Title.objects.order_by('pk').values_list(
+                    'pk', 'year', 'category_id', 'rating', 'rating_count',
+                    'name_key'
+                )
+            )
+            self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+            self.year = np.array([row[1] for row in rows], dtype=np.int32)
+            self.category = np.array(
+                [row[2] if row[2] is not None else -1 for row in rows],
+                dtype=np.int64
+            )
+            self.rating = np.array(
+                [row[3] if row[3] is not None else np.nan for row in rows],
+                dtype=np.float64
+            )
+            self.rating_count = np.array(
+                [row[4] for row in rows], dtype=np.int64
+            )
+            self.alive = np.ones(len(rows), dtype=bool)
+            self.position = {row[0]: index for index, row in enumerate(rows)}
+            self.name_key_of = {
+                index: row[5] for index, row in enumerate(rows)
+            }
+            self.name_keys = sorted(
+                (key, index) for index, key in self.name_key_of.items()
+            )
+            self.categories = dict(
+                Category.objects.values_list('slug', 'pk')
+            )
+            self.genres = {}
+            for title_id, slug in TitleGenre.objects.values_list(
+                'title_id', 'genre__slug'
+            ):
+                self.get_genre_mask(slug)[self.position[title_id]] = True
+            self.dirty = set()
+            self.versions = versions
+            self.loaded_at = self.checked_at = time.monotonic()
+
+    def get_genre_mask(self, slug):
+        if slug not in self.genres:
+            self.genres[slug] = np.zeros(len(self.ids), dtype=bool)
+        return self.genres[slug]
+
+    def append_rows(self, count):
+        def grow(array, fill):
+            return np.concatenate(
+                (array, np.full(count, fill, dtype=array.dtype))
+            )
+
+        self.ids = grow(self.ids, 0)
+        self.year = grow(self.year, 0)
+        self.category = grow(self.category, -1)
+        self.rating = grow(self.rating, np.nan)
+        self.rating_count = grow(self.rating_count, 0)
+        self.alive = grow(self.alive, False)
+        for slug, mask in self.genres.items():
+            self.genres[slug] = grow(mask, False)
+
+    def remove_name_key(self, index):
+        key = self.name_key_of.pop(index, None)
+        if key is None:
+            return
+        position = bisect_left(self.name_keys, (key, index))
+        if self.name_keys[position:position + 1] == [(key, index)]:
+            del self.name_keys[position]
+
+    def apply_dirty(self):
+        """Перечитывает из БД только изменённые произведения."""
+        with self.lock:
+            if not self.dirty:
+                return
+            dirty, self.dirty = self.dirty, set()
+            rows = Title.objects.filter(pk__in=dirty).values_list(
+                'pk', 'year', 'category_id', 'rating', 'rating_count',
+                'name_key'
+            )
+            rows = {row[0]: row for row in rows}
+            new_ids = sorted(pk for pk in rows if pk not in self.position)
+            if new_ids:
+                start = len(self.ids)
+                self.append_rows(len(new_ids))
+                for offset, pk in enumerate(new_ids):
+                    self.position[pk] = start + offset
+                    self.ids[start + offset] = pk
+            genres = TitleGenre.objects.filter(
+                title_id__in=rows
+            ).values_list('title_id', 'genre__slug')
+            for pk in dirty:
+                index = self.position.get(pk)
+                if index is None:
+                    continue
+                for mask in self.genres.values():
+                    mask[index] = False
+                self.remove_name_key(index)
+                row = rows.get(pk)
+                self.alive[index] = row is not None
+                if row is None:
+                    continue
+                _, year, category_id, rating, rating_count, name_key = row
+                self.year[index] = year
+                self.category[index] = (
+                    category_id if category_id is not None else -1
+                )
+                self.rating[index] = rating if rating is not None else np.nan
+                self.rating_count[index] = rating_count
+                self.name_key_of[index] = name_key
+                insort(self.name_keys, (name_key, index))
+            for title_id, slug in genres:
+                self.get_genre_mask(slug)[self.position[title_id]] = True
+            if new_ids and not np.all(np.diff(self.ids) > 0):
+                # Порядок по id нужен для сортировки по умолчанию; новые
+                # записи почти всегда имеют больший id, иначе - перезагрузка.
+                self.load()
+
+    def is_stale(self):
+        """Истёк ли `ttl` или изменилась версия таблиц каталога в БД."""
+        now = time.monotonic()
+        if self.loaded_at is None or now - self.loaded_at > self.ttl:
+            return True
+        if now - self.checked_at < self.check_interval:
+            return False
+        self.checked_at = now
+        return TableVersion.objects.get_versions(
+            self.versioned_models
+        ) != self.versions
+
+    def ensure_loaded(self):
+        if self.is_stale():
+            self.load()
+        else:
+            self.apply_dirty()
+
+    def filter(self, query_params):
+        """Возвращает массив id произведений или None, если запрос
+        не поддерживается движком и должен выполняться через ORM."""
+        if not self.available:
+            return None
+        if not self.supported_params.issuperset(query_params):
+            return None
+        ordering = query_params.get('ordering')
+        if ordering and ordering.lstrip('-') not in self.ordering_fields:
+            ordering = None
+        year = query_params.get('year') or None
+        if year is not None:
+            try:
+                year = int(year)
+            except ValueError:
+                return None
+
+        with self.lock:
+            self.ensure_loaded()
+            mask = self.get_mask(query_params, year)
+            if mask is None:
+                return self.ids[:0]
+            indexes = np.flatnonzero(mask)
+            if ordering and ordering.lstrip('-') != 'id':
+                indexes = self.sort(indexes, ordering)
+            elif ordering == '-id':
+                indexes = indexes[::-1]
+            return self.ids[indexes]
+
+    def get_mask(self, query_params, year):
+        """Маска подходящих строк или None, если жанр неизвестен."""
+        mask = self.alive.copy()
+        category = query_params.get('category')
+        if category:
+            mask &= self.category == self.categories.get(category, -2)
+        genre = query_params.get('genre')
+        if genre:
+            genre_mask = self.genres.get(genre)
+            if genre_mask is None:
+                return None
+            mask &= genre_mask
+        if year is not None:
+            mask &= self.year == year
+        name = query_params.get('name')
+        if name:
+            prefix = normalize_search_key(name)
+            start = bisect_left(self.name_keys, (prefix,))
+            end = bisect_left(self.name_keys, (prefix + PREFIX_UPPER_BOUND,))
+            name_mask = np.zeros(len(self.ids), dtype=bool)
+            name_mask[[index for _, index in self.name_keys[start:end]]] = True
+            mask &= name_mask
+        return mask
+
+    def sort(self, indexes, ordering):
+        """Сортировка как в `get_keyset_order_by`: NULL меньше значений."""
+        values = getattr(self, ordering.lstrip('-'))[indexes]
+        if values.dtype.kind == 'f':
+            values = np.where(np.isnan(values), -np.inf, values)
+        ids = self.ids[indexes]
+        if ordering.startswith('-'):
+            order = np.lexsort((-ids, -values))
+        else:
+            order = np.lexsort((ids, values))
+        return indexes[order]
+
+
+catalog_engine = CatalogEngine()
@@ -0,0 +1,77 @@
+"""Потоковая выгрузка каталога произведений в NDJSON и CSV.
+
+Произведения читаются через `iterator(chunk_size=...)`, жанры дочитываются
+одним запросом на пачку, категории и slug жанров берутся из кэша
+справочников. В памяти находится не больше одной пачки строк.
+"""
+import csv
+import json
+from itertools import islice
+
+from api.lookups import category_lookup, genre_lookup
+from reviews.models import Title, TitleGenre
+
+EXPORT_FIELDS = (
+    'id', 'name', 'year', 'description', 'category', 'genre', 'rating'
+)
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_titles(chunk_size=EXPORT_CHUNK_SIZE):
+    """Словари произведений с рейтингом, slug категории и жанров."""
+    rows = Title.objects.order_by('pk').values_list(
+        'id', 'name', 'year', 'description', 'category_id', 'rating'
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        categories = category_lookup.get_id_map()
+        genre_map = genre_lookup.get_id_map()
+        genres = {}
+        links = TitleGenre.objects.filter(
+            title_id__in=[row[0] for row in chunk]
+        ).order_by('pk').values_list('title_id', 'genre_id')
+        for title_id, genre_id in links:
+            genre = genre_map.get(genre_id)
+            if genre is not None:
+                genres.setdefault(title_id, []).append(genre.slug)
+        for pk, name, year, description, category_id, rating in chunk:
+            category = categories.get(category_id)
+            yield {
+                'id': pk,
+                'name': name,
+                'year': year,
+                'description': description,
+                'category': category.slug if category is not None else None,
+                'genre': genres.get(pk, []),
+                'rating': int(rating) if rating is not None else None,
+            }
+
+
+def render_ndjson(titles):
+    for title in titles:
+        yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(titles):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for title in titles:
+        yield writer.writerow(
+            ','.join(title[field]) if field == 'genre' else title[field]
+            for field in EXPORT_FIELDS
+        )
+
+
+EXPORT_FORMATS = {
+    'ndjson': (render_ndjson, 'application/x-ndjson'),
+    'csv': (render_csv, 'text/csv'),
+}
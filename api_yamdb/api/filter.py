@@ -1,14 +1,120 @@
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from api.lookups import category_lookup, genre_lookup
+from api.pagination import get_keyset_order_by
+from reviews.models import Title, TitleTrigram
+
+FUZZY_SIMILARITY_THRESHOLD = 0.3
+FUZZY_MAX_RESULTS = 100
 
-from reviews.models import Title
+
+def build_fts_query(value):
+    """Собирает запрос FTS5: все слова с поиском по префиксу."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', value))
 
 
 class TitleFilter(filters.FilterSet):
     """Настройка фильтра для произведений."""
-    category = filters.CharFilter(field_name='category__slug')
-    genre = filters.CharFilter(field_name='genre__slug')
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    category = filters.CharFilter(method='filter_category')
+    genre = filters.CharFilter(method='filter_genre')
+    name = filters.CharFilter(field_name='name_key', lookup_expr='prefix')
+    search = filters.CharFilter(method='filter_search')
+    fuzzy = filters.CharFilter(method='filter_fuzzy')
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'rating', 'name_key')
+
+    def filter_category(self, queryset, name, value):
+        """Фильтр по slug категории без соединения с её таблицей."""
+        category = category_lookup.get_by_slug(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
+
+    def filter_genre(self, queryset, name, value):
+        """Фильтр по slug жанра через промежуточную таблицу."""
+        genre = genre_lookup.get_by_slug(value)
+        if genre is None:
+            return queryset.none()
+        return queryset.filter(titlegenre__genre_id=genre.pk)
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию.
+
+        На SQLite используется индекс FTS5 с сортировкой по релевантности,
+        на остальных СУБД - поиск подстроки.
+        """
+        query = build_fts_query(value)
+        if not query:
+            return queryset
+        if connection.vendor != 'sqlite':
+            return queryset.filter(
+                Q(name__icontains=value) | Q(description__icontains=value)
+            )
+        return queryset.filter(
+            search__document__match=query
+        ).order_by('search__rank', 'id')
+
+    def filter_fuzzy(self, queryset, name, value):
+        """Поиск по названию с опечатками через индекс триграмм.
+
+        Результаты отсортированы по убыванию сходства и ограничены
+        `FUZZY_MAX_RESULTS` лучшими совпадениями.
+        """
+        ranked = TitleTrigram.objects.similar(
+            value, FUZZY_SIMILARITY_THRESHOLD, FUZZY_MAX_RESULTS
+        )
+        title_ids = [title_id for title_id, _ in ranked]
+        return queryset.filter(pk__in=title_ids).order_by(
+            Case(
+                *(When(pk=pk, then=Value(position))
+                  for position, pk in enumerate(title_ids)),
+                output_field=IntegerField()
+            )
+        )
+
+
+class SearchKeyFilter(SearchFilter):
+    """Поиск без учёта регистра по префиксу полей `SearchKeyField`.
+
+    Строка поиска не разбивается на слова: ищется префикс всего значения,
+    что позволяет выполнить запрос как диапазон по индексу.
+    """
+
+    def get_search_terms(self, request):
+        params = request.query_params.get(self.search_param, '')
+        params = params.replace('\x00', '')
+        return [params] if params.strip() else []
+
+    def construct_search(self, field_name):
+        return f'{field_name}__prefix'
+
+
+class KeysetOrderingFilter(OrderingFilter):
+    """Сортировка по одному из `ordering_fields` с добавлением id.
+
+    Порядок совпадает с курсорной пагинацией: NULL меньше любых значений,
+    записи с равными значениями упорядочены по id.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get(self.ordering_param)
+        fields = getattr(view, 'ordering_fields', ())
+        if ordering and ordering.lstrip('-') in fields:
+            return ordering
+        return None
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if ordering is None:
+            return queryset
+        field = queryset.model._meta.get_field(ordering.lstrip('-'))
+        return queryset.order_by(
+            *get_keyset_order_by(field, ordering.startswith('-'))
+        )
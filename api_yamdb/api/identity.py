@@ -0,0 +1,27 @@
+"""Кэш объектов в пределах одного запроса (identity map).
+
+Вьюсеты, сериализаторы и разрешения получают родительские объекты
+(произведение отзыва, отзыв комментария) через `get_request_object`,
+поэтому каждый из них загружается из БД не больше одного раза за запрос.
+Кэш хранится на объекте `HttpRequest` и исчезает вместе с ним; изменения,
+сделанные в БД запросами `update()`, в закэшированных объектах не видны.
+"""
+from rest_framework.generics import get_object_or_404
+
+
+def get_identity_map(request):
+    request = getattr(request, '_request', request)
+    if not hasattr(request, 'identity_map'):
+        request.identity_map = {}
+    return request.identity_map
+
+
+def get_request_object(request, model, **lookup):
+    """Объект по условиям `lookup` или 404, один раз за запрос."""
+    key = (model, frozenset(
+        (name, str(value)) for name, value in lookup.items()
+    ))
+    identity_map = get_identity_map(request)
+    if key not in identity_map:
+        identity_map[key] = get_object_or_404(model, **lookup)
+    return identity_map[key]
@@ -0,0 +1,98 @@
+"""Кэш строк маленьких справочников (категорий и жанров) в памяти процесса.
+
+Каждый процесс хранит свою копию таблицы и сверяет её с версией таблицы в
+БД (`reviews.TableVersion`), которую запись в справочник увеличивает в той
+же транзакции, поэтому изменения из других процессов тоже видны. Версия
+читается не чаще раза в `check_interval` секунд, копия перечитывается
+одним запросом при смене версии и не реже раза в `ttl` секунд. Если slug
+или id нет в копии, версия сверяется сразу: объект, только что созданный
+другим процессом, находится с первого обращения.
+"""
+import threading
+import time
+
+from reviews.models import Category, Genre, TableVersion
+
+
+class SlugLookup:
+    """Поиск объектов справочника по slug и id без запросов к БД."""
+
+    def __init__(self, model, ttl=300, check_interval=1):
+        self.model = model
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.version = None
+        self.loaded_at = None
+        self.checked_at = None
+        self.by_id = {}
+        self.by_slug = {}
+        self.representations = {}
+
+    def __deepcopy__(self, memo):
+        # Поля DRF копируются вместе с аргументами, а кэш общий на процесс.
+        return self
+
+    def ensure_fresh(self, max_age=None):
+        """Перечитывает справочник, если он изменился в БД.
+
+        Версия сверяется, если с прошлой проверки прошло не меньше
+        `max_age` секунд (по умолчанию `check_interval`). Возвращает True,
+        если справочник перечитан.
+        """
+        if max_age is None:
+            max_age = self.check_interval
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < max_age:
+            return False
+        # Версия читается до строк: запись между запросами только
+        # вызовет лишнее перечитывание при следующей проверке.
+        version = TableVersion.objects.get_version(self.model)
+        if version == self.version and now - self.loaded_at < self.ttl:
+            self.checked_at = now
+            return False
+        with self.lock:
+            objects = list(self.model.objects.all())
+            self.by_id = {obj.pk: obj for obj in objects}
+            self.by_slug = {obj.slug: obj for obj in objects}
+            self.representations = {}
+            self.version = version
+            self.loaded_at = self.checked_at = now
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.version = None
+            self.checked_at = None
+
+    def get_by_slug(self, slug):
+        self.ensure_fresh()
+        if slug not in self.by_slug:
+            self.ensure_fresh(max_age=0)
+        return self.by_slug.get(slug)
+
+    def get_by_id(self, pk):
+        self.ensure_fresh()
+        if pk not in self.by_id:
+            self.ensure_fresh(max_age=0)
+        return self.by_id.get(pk)
+
+    def get_id_map(self):
+        """Словарь объектов по id для обработки многих строк подряд."""
+        self.ensure_fresh()
+        return self.by_id
+
+    def get_representation(self, pk, serializer_class):
+        """Данные сериализатора для объекта, вычисленные один раз."""
+        obj = self.get_by_id(pk) if pk is not None else None
+        key = (serializer_class, pk)
+        if key not in self.representations:
+            self.representations[key] = (
+                serializer_class(obj).data if obj is not None else None
+            )
+        data = self.representations[key]
+        return dict(data) if data is not None else None
+
+
+category_lookup = SlugLookup(Category)
+genre_lookup = SlugLookup(Genre)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from api.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, iter_titles
+
+
+class Command(BaseCommand):
+    """Выгружает каталог произведений в NDJSON или CSV."""
+
+    help = 'Потоковая выгрузка произведений с рейтингом, жанрами и категорией.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', choices=tuple(EXPORT_FORMATS), default='ndjson'
+        )
+        parser.add_argument(
+            '--output', help='Файл для выгрузки, по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        render = EXPORT_FORMATS[options['type']][0]
+        lines = render(iter_titles(options['chunk_size']))
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as file:
+            file.writelines(lines)
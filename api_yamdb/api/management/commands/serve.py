@@ -0,0 +1,173 @@
+import gc
+import os
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+from api.warmup import warm_up
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # pragma: no cover
+    BaseApplication = None
+
+
+def get_memory(pid):
+    """Память процесса в КБ из /proc/<pid>/smaps_rollup или None."""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as file:
+            lines = file.read().splitlines()[1:]
+    except OSError:
+        return None
+    values = {}
+    for line in lines:
+        name, value = line.split(':', 1)
+        values[name] = int(value.split()[0])
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'shared': values['Shared_Clean'] + values['Shared_Dirty'],
+        'private': values['Private_Clean'] + values['Private_Dirty'],
+    }
+
+
+if BaseApplication is not None:
+    class PreforkApplication(BaseApplication):
+        """Gunicorn с приложением, которое загружает команда `serve`."""
+
+        def __init__(self, command, options):
+            self.command = command
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for name, value in self.options.items():
+                self.cfg.set(name, value)
+
+        def load(self):
+            return self.command.load_application()
+
+
+class Command(BaseCommand):
+    """Gunicorn с приложением, прогретым в главном процессе до fork."""
+
+    help = (
+        'Загружает и прогревает приложение в главном процессе gunicorn, '
+        'замораживает объекты сборщика мусора (gc.freeze) и запускает '
+        'воркеры через fork.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bind', default='127.0.0.1:8000', help='Адрес host:port.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1
+        )
+        parser.add_argument(
+            '--threads', type=int, default=1,
+            help='Потоков в воркере, больше 1 - воркеры gthread.'
+        )
+        parser.add_argument(
+            '--timeout', type=int, default=30,
+            help='Через сколько секунд без ответа воркер перезапускается.'
+        )
+        parser.add_argument(
+            '--no-warm-up', action='store_false', dest='warm_up',
+            help='Не прогревать приложение перед fork.'
+        )
+        parser.add_argument(
+            '--stats-interval', type=float, default=60,
+            help='Период отчёта о памяти воркеров в секундах, 0 - только '
+                 'при запуске.'
+        )
+        parser.add_argument(
+            '--access-log', action='store_true',
+            help='Писать журнал запросов в stderr.'
+        )
+
+    def handle(self, *args, **options):
+        if BaseApplication is None:
+            raise CommandError('Нужен gunicorn: pip install gunicorn')
+        self.warm_up = options['warm_up']
+        self.stats_interval = options['stats_interval']
+        PreforkApplication(self, {
+            'bind': options['bind'],
+            'workers': max(options['workers'], 1),
+            'threads': max(options['threads'], 1),
+            'timeout': options['timeout'],
+            'preload_app': True,
+            'accesslog': '-' if options['access_log'] else None,
+            'when_ready': self.when_ready,
+            'pre_fork': self.pre_fork,
+            'post_fork': self.post_fork,
+            'on_exit': self.on_exit,
+        }).run()
+
+    def load_application(self):
+        # Сборщик мусора не запускается до fork: иначе он освобождает
+        # объекты между загрузкой и gc.freeze() и оставляет дыры в общих
+        # страницах памяти. Главный процесс только управляет воркерами,
+        # поэтому в нём сборщик остаётся выключенным.
+        gc.disable()
+        started = time.perf_counter()
+        application = get_wsgi_application()
+        if self.warm_up:
+            warm_up(application)
+        self.stdout.write(
+            f'Приложение загружено за {time.perf_counter() - started:.2f} с'
+        )
+        return application
+
+    def when_ready(self, server):
+        # Объекты главного процесса больше не просматриваются сборщиком
+        # мусора, поэтому их страницы памяти остаются общими с воркерами.
+        gc.freeze()
+        self.stdout.write(
+            f'Слушаю {", ".join(str(sock) for sock in server.LISTENERS)}, '
+            f'воркеров: {server.num_workers}, '
+            f'объектов заморожено: {gc.get_freeze_count()}'
+        )
+        self.stdout.flush()
+        threading.Thread(
+            target=self.report_memory, args=(server,), daemon=True
+        ).start()
+
+    def pre_fork(self, server, worker):
+        # Воркеры, перезапущенные после таймаута, тоже получают
+        # замороженными объекты, созданные главным процессом с тех пор.
+        gc.freeze()
+
+    def post_fork(self, server, worker):
+        gc.enable()
+
+    def on_exit(self, server):
+        self.stdout.write('Сервер остановлен')
+        self.stdout.flush()
+
+    def report_memory(self, server):
+        # Первый отчёт - когда воркеры уже запущены.
+        time.sleep(1)
+        while True:
+            self.report(server)
+            if self.stats_interval <= 0:
+                return
+            time.sleep(self.stats_interval)
+
+    def report(self, server):
+        for name, pid in (
+            ('главный', os.getpid()),
+            *(('воркер', pid) for pid in sorted(server.WORKERS)),
+        ):
+            memory = get_memory(pid)
+            if memory is None:
+                continue
+            self.stdout.write(
+                f'{name} {pid}: RSS {memory["rss"] / 1024:.1f} МБ, '
+                f'PSS {memory["pss"] / 1024:.1f} МБ, '
+                f'общая {memory["shared"] / 1024:.1f} МБ, '
+                f'собственная {memory["private"] / 1024:.1f} МБ'
+            )
+        self.stdout.flush()
@@ -1,9 +1,280 @@
-from rest_framework import filters, viewsets
+import hashlib
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.cache import get_cache, get_response_key
+from api.fast import compile_serializer
+from api.filter import SearchKeyFilter
 from api.permissions import IsAdminOrReadOnly
+from api.rows import get_row_plan
+
+
+class ResponseCacheMixin:
+    """Кэширует ответы на анонимные GET-запросы.
+
+    `cache_models` - модели, изменение которых сбрасывает кэш вьюсета,
+    `cache_name` - ключ TTL в настройке `API_CACHE['TIMEOUTS']`.
+    """
+
+    cache_models = ()
+    cache_name = None
+
+    def is_cacheable(self, request):
+        return (
+            settings.API_CACHE['ENABLED']
+            and request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = get_response_key(request, self.cache_models)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content)
+            for name, value in headers:
+                response[name] = value
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            timeout = settings.API_CACHE['TIMEOUTS'].get(self.cache_name)
+
+            def store(response):
+                # Заголовки вью (Content-Type, Vary, Allow); заголовки
+                # middleware добавляются к ответу из кэша заново.
+                cache.set(
+                    key, (response.content, list(response.items())), timeout
+                )
+
+            response.add_post_render_callback(store)
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на условные GET-запросы, не сериализуя данные.
+
+    Валидаторы строятся по дате последнего изменения, которую возвращает
+    `get_last_modified()`: её хранит родительский объект, поэтому проверка
+    стоит одного запроса по первичному ключу. Дата не учитывает изменения
+    связанных объектов, которые выводит `?expand=`, поэтому такие запросы
+    обрабатываются без условных ответов.
+    """
+
+    def get_last_modified(self):
+        raise ImproperlyConfigured(
+            f'{type(self).__name__} должен определить get_last_modified().'
+        )
+
+    def is_conditional(self, request):
+        return not request.query_params.get('expand')
+
+    def get_validators(self, request):
+        last_modified = self.get_last_modified()
+        etag = hashlib.md5('\n'.join((
+            last_modified.isoformat(),
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+        )).encode()).hexdigest()
+        return quote_etag(etag), last_modified.timestamp()
+
+    def conditional(self, action, request, *args, **kwargs):
+        if not self.is_conditional(request):
+            return action(request, *args, **kwargs)
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified)
+        )
+        if response is None:
+            response = action(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+
+class FastListMixin:
+    """Список без сборки полных экземпляров модели.
+
+    С настройкой `FAST_SERIALIZERS` ответ строит скомпилированный
+    сериализатор (`api.fast`), с `ROW_READS` - обычный сериализатор по
+    строкам со `__slots__` (`api.rows`). Если сериализатор не подходит ни
+    для одного из путей, используется обычный путь DRF.
+    """
+
+    def get_compiled_serializer(self):
+        if not settings.FAST_SERIALIZERS:
+            return None
+        return compile_serializer(self.get_serializer())
+
+    def get_row_plan(self):
+        if not settings.ROW_READS:
+            return None
+        return get_row_plan(self.get_serializer(), self.get_cursor_columns())
+
+    def get_cursor_columns(self):
+        """Поля, по которым курсорная пагинация вычисляет позицию."""
+        keyset = getattr(self.paginator, 'keyset_pagination_class', None)
+        if keyset is None:
+            return ()
+        return (keyset.ordering, *keyset.ordering_fields)
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is not None:
+            return self.list_compiled(compiled)
+        plan = self.get_row_plan()
+        if plan is not None:
+            return self.list_rows(plan)
+        return super().list(request, *args, **kwargs)
+
+    def list_compiled(self, compiled):
+        rows = compiled.values(
+            self.filter_queryset(self.get_queryset()),
+            self.get_cursor_columns()
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.represent(page))
+        return Response(compiled.represent(rows))
+
+    def list_rows(self, plan):
+        rows = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            serializer = self.get_serializer(
+                plan.load_related(page), many=True
+            )
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(plan.load_related(rows), many=True)
+        return Response(serializer.data)
+
+
+def get_ordering_fields(queryset, model_fields):
+    """Имена полей модели, по которым отсортирован queryset."""
+    for order in queryset.query.order_by:
+        if not isinstance(order, str):
+            order = getattr(getattr(order, 'expression', None), 'name', '')
+        name = order.lstrip('-').split('__')[0]
+        if name in model_fields:
+            yield model_fields[name].name
+
+
+def parse_field_names(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Параметры `?fields=` и `?expand=` для чтения.
+
+    `fields` оставляет в ответе перечисленные поля, `expand` включает поля
+    из `Meta.expandable_fields` сериализатора. Неизвестные имена в `fields`
+    дают ответ 400 с их списком. Столбцы, связи select_related и
+    prefetch_related, не нужные оставшимся полям, не загружаются.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.sparse_actions:
+            self.check_field_names(request.query_params)
+
+    def check_field_names(self, params):
+        serializer_class = self.get_serializer_class()
+        allowed = set(serializer_class().fields) | set(
+            getattr(serializer_class.Meta, 'expandable_fields', ())
+        )
+        unknown = parse_field_names(params.get('fields', '')) - allowed
+        if unknown:
+            names = ', '.join(sorted(unknown))
+            raise ValidationError({
+                'fields': [f'Неизвестные поля: {names}.']
+            })
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is None:
+            return context
+        params = self.request.query_params
+        context['expand'] = parse_field_names(params.get('expand', ''))
+        if self.action in self.sparse_actions:
+            context['fields'] = parse_field_names(params.get('fields', ''))
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions:
+            return queryset
+        return self.trim_queryset(queryset)
+
+    def trim_queryset(self, queryset):
+        """Загружает только столбцы и связи, нужные полям сериализатора."""
+        model = queryset.model
+        model_fields = {}
+        for field in model._meta.concrete_fields:
+            model_fields[field.name] = field
+            model_fields[field.attname] = field
+        select_related = queryset.query.select_related
+        if not isinstance(select_related, dict):
+            select_related = {}
+        prefetches = {
+            getattr(lookup, 'prefetch_through', lookup).split('__')[0]:
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+        }
+
+        only = {model._meta.pk.name}
+        joins = set()
+        used_prefetches = set()
+        for field in self.get_serializer().fields.values():
+            source = field.source.split('.')[0]
+            if source in prefetches:
+                used_prefetches.add(source)
+            elif source in model_fields:
+                model_field = model_fields[source]
+                only.add(model_field.name)
+                slug_field = getattr(field, 'slug_field', None)
+                if model_field.name in select_related and slug_field:
+                    joins.add(model_field.name)
+                    only.add(f'{model_field.name}__{slug_field}')
+            else:
+                # Свойство или метод модели: нужные им столбцы неизвестны.
+                return queryset
+        # Позицию курсора пагинация читает из полей сортировки.
+        only.update(get_ordering_fields(queryset, model_fields))
+        for field in queryset._known_related_objects:
+            only.add(field.name)
+
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        queryset = queryset.prefetch_related(None).prefetch_related(
+            *(prefetches[name] for name in used_prefetches)
+        )
+        return queryset.only(*only)
 
 
-class CategoryGenreMixin(viewsets.GenericViewSet,
+class CategoryGenreMixin(ResponseCacheMixin,
+                         SparseFieldsMixin,
+                         viewsets.GenericViewSet,
                          viewsets.mixins.CreateModelMixin,
                          viewsets.mixins.DestroyModelMixin,
                          viewsets.mixins.ListModelMixin,
@@ -11,6 +282,6 @@ class CategoryGenreMixin(viewsets.GenericViewSet,
     """Миксин для вьюсетов Категории и Жанры"""
 
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('name',)
+    filter_backends = (SearchKeyFilter,)
+    search_fields = ('name_key',)
     lookup_field = 'slug'
@@ -0,0 +1,236 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict, namedtuple
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, F, Func, Q, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Keyset = namedtuple('Keyset', ['reverse', 'value', 'pk'])
+
+
+def get_keyset_order_by(field, descending):
+    """Сортировка по (field, id), где NULL меньше любых значений."""
+    if field.primary_key:
+        return ('-pk',) if descending else ('pk',)
+    if descending:
+        return (F(field.name).desc(nulls_last=True), '-pk')
+    return (F(field.name).asc(nulls_first=True), 'pk')
+
+
+class RowValueCompare(Func):
+    """Сравнение строк значений `(field, id) > (value, pk)`.
+
+    В отличие от `field > value OR (field = value AND id > pk)` SQLite
+    использует такое условие как диапазон индекса (field, id).
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, lhs, rhs, operator):
+        self.operator = operator
+        super().__init__(*lhs, *rhs)
+
+    def as_sql(self, compiler, connection):
+        sqls, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        size = len(sqls) // 2
+        return (
+            f'({", ".join(sqls[:size])}) {self.operator} '
+            f'({", ".join(sqls[size:])})'
+        ), params
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по составному ключу (поле сортировки, id).
+
+    В отличие от `CursorPagination` курсор хранит значение поля сортировки
+    вместе с id последней записи, поэтому страница любой глубины выбирается
+    диапазоном индекса (поле, id) без OFFSET. Значения NULL считаются
+    меньше любых других и выбираются отдельным диапазоном, только если
+    страница на них заходит.
+    """
+
+    ordering = 'id'
+    ordering_fields = ()
+    ordering_query_param = 'ordering'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = queryset.model._meta.get_field(self.ordering.lstrip('-'))
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        descending = self.ordering.startswith('-') != reverse
+        queryset = queryset.order_by(*self.get_order_by(descending))
+        results = []
+        for condition in self.get_keyset_filters(descending):
+            results += queryset.filter(condition)[
+                :self.page_size + 1 - len(results)
+            ]
+            if len(results) > self.page_size:
+                break
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get(self.ordering_query_param)
+        if ordering and ordering.lstrip('-') in self.ordering_fields:
+            return ordering
+        return self.ordering
+
+    def get_order_by(self, descending):
+        return get_keyset_order_by(self.field, descending)
+
+    def get_keyset_filters(self, descending):
+        """Условия для записей, следующих за курсором, по порядку.
+
+        Каждое условие - диапазон индекса (поле, id). Запись с NULL в
+        поле сортировки не попадает в диапазон сравнения строк, поэтому
+        такие записи выбираются отдельным условием.
+        """
+        if self.cursor is None:
+            return [Q()]
+        name, value, pk = self.field.name, self.cursor.value, self.cursor.pk
+        if self.field.primary_key:
+            return [Q(pk__lt=pk) if descending else Q(pk__gt=pk)]
+        if value is None:
+            if descending:
+                return [Q(**{f'{name}__isnull': True, 'pk__lt': pk})]
+            return [
+                Q(**{f'{name}__isnull': True, 'pk__gt': pk}),
+                Q(**{f'{name}__isnull': False}),
+            ]
+        conditions = [RowValueCompare(
+            (F(name), F('pk')),
+            (Value(value, output_field=self.field), Value(pk)),
+            '<' if descending else '>'
+        )]
+        if descending and self.field.null:
+            conditions.append(Q(**{f'{name}__isnull': True}))
+        return conditions
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_keyset(self.page[-1], False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_keyset(self.page[0], True))
+
+    def get_keyset(self, instance, reverse):
+        value = self.field.value_from_object(instance)
+        if value is not None:
+            value = self.field.value_to_string(instance)
+        return Keyset(reverse=reverse, value=value, pk=instance.pk)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            pk = int(tokens['i'][0])
+            value = tokens.get('p', [None])[0]
+            if value is not None:
+                value = self.field.to_python(value)
+            elif not self.field.null:
+                raise ValueError('Нет значения поля сортировки')
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Keyset(reverse=reverse, value=value, pk=pk)
+
+    def encode_cursor(self, cursor):
+        tokens = {'i': str(cursor.pk)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        if cursor.value is not None:
+            tokens['p'] = cursor.value
+
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class TitleKeysetPagination(KeysetPagination):
+    """Курсорная пагинация произведений по id, году или рейтингу."""
+
+    ordering = 'id'
+    ordering_fields = ('id', 'year', 'rating')
+
+
+class PubDateKeysetPagination(KeysetPagination):
+    """Курсорная пагинация отзывов и комментариев по дате публикации."""
+
+    ordering = 'pub_date'
+    ordering_fields = ('pub_date',)
+
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """Постраничная пагинация с курсорным режимом по запросу.
+
+    Если в запросе передан параметр `cursor` (для первой страницы - пустой),
+    используется `keyset_pagination_class`.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        cursor_query_param = self.keyset_pagination_class.cursor_query_param
+        if cursor_query_param in request.query_params:
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(OptionalKeysetPagination):
+    """Пагинация произведений."""
+
+    keyset_pagination_class = TitleKeysetPagination
+
+
+class PubDatePagination(OptionalKeysetPagination):
+    """Пагинация отзывов и комментариев."""
+
+    keyset_pagination_class = PubDateKeysetPagination
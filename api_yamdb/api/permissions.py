@@ -29,7 +29,7 @@ class IsAuthorModeratorAdmin(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         if request.user.is_authenticated:
-            return (obj.author == request.user
+            return (obj.author_id == request.user.id
                     or request.user.is_superuser
                     or request.user.is_admin
                     or request.user.is_moderator)
@@ -0,0 +1,117 @@
+"""Быстрые рендереры и парсеры: JSON на orjson и MessagePack.
+
+Ответ совпадает с `JSONRenderer` DRF: даты, Decimal, ленивые строки и
+прочие типы, которые orjson не знает, кодируются тем же
+`encoders.JSONEncoder.default`. Если orjson не установлен, данные нельзя
+закодировать (целые больше 64 бит) или запрошен отступ, работа
+передаётся стандартным классам DRF. В отличие от DRF NaN и бесконечности
+кодируются как null, а не вызывают ошибку.
+"""
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+if orjson is not None:
+    # Даты передаются в default, чтобы формат совпадал с DRF (`Z` для UTC).
+    ORJSON_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+# orjson читает целые больше 64 бит как float, такие тела разбирает json.
+# Цифры заменяются нулями, и длинное число ищется как подстрока: это
+# быстрее регулярного выражения.
+DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'0' * 9)
+LONG_NUMBER = b'0' * 20
+
+
+class FastJSONRenderer(JSONRenderer):
+    """`JSONRenderer` на orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type,
+                               renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        try:
+            content = orjson.dumps(
+                data, default=JSONEncoder().default, option=ORJSON_OPTIONS
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # Как и DRF, экранируем U+2028 и U+2029 для совместимости с JS.
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
+
+
+class FastJSONParser(JSONParser):
+    """`JSONParser` на orjson."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        content = stream.read()
+        if (
+            encoding.lower().replace('-', '') == 'utf8'
+            and LONG_NUMBER not in content.translate(DIGITS_TO_ZERO)
+        ):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Сообщение об ошибке берётся у стандартного парсера.
+                pass
+        return super().parse(BytesIO(content), media_type, parser_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Ответ в MessagePack с той же структурой, что и JSON.
+
+    Типы, которых нет в MessagePack (даты, Decimal, ленивые строки),
+    приводятся так же, как в JSON-ответе.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+class MessagePackParser(BaseParser):
+    """Разбирает тело запроса в MessagePack."""
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,220 @@
+"""Лёгкие строки для чтения списков обычными сериализаторами DRF.
+
+Вместо экземпляров модели (с `_state` и всеми столбцами) queryset отдаёт
+объекты классов со `__slots__`, в которых есть только атрибуты, нужные
+полям сериализатора:
+
+* поля модели - значение столбца;
+* `SlugRelatedField` по внешнему ключу - вложенная строка с одним
+  атрибутом slug (`review.author.username`);
+* обратные связи (`titlegenre_set`) - список строк связанной модели,
+  загруженный одним запросом на страницу, с методом `all()`.
+
+Сериализатор, поля которого нельзя так описать, получает `None` из
+`get_row_plan`, и список строится из экземпляров модели. Путь включается
+настройкой `ROW_READS`.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query import ValuesListIterable
+from rest_framework import serializers
+
+_plans = {}
+
+
+class RelatedRows(list):
+    """Строки обратной связи, которые читаются как менеджер: `.all()`."""
+
+    __slots__ = ()
+
+    def all(self):
+        return self
+
+
+def make_row_class(model, names, lazy_names=()):
+    """Класс строки модели со `__slots__` для перечисленных атрибутов.
+
+    `lazy_names` не передаются в конструктор и заполняются позже.
+    """
+    namespace = {}
+    exec(
+        'def __init__(self, {0}):\n    {1}\n'.format(
+            ', '.join(names),
+            '\n    '.join(f'self.{name} = {name}' for name in names)
+        ),
+        namespace
+    )
+    return type(f'{model.__name__}Row', (), {
+        '__slots__': (*names, *lazy_names),
+        '__init__': namespace['__init__'],
+        '__module__': __name__,
+    })
+
+
+class RowPlan:
+    """Столбцы запроса и функция, собирающая из них строку."""
+
+    def __init__(self, columns, make_row, related):
+        self.columns = columns
+        self.related = related
+
+        class RowIterable(ValuesListIterable):
+            def __iter__(self):
+                return map(make_row, super().__iter__())
+
+        self.iterable_class = RowIterable
+
+    def values(self, queryset):
+        """Queryset, который отдаёт строки вместо экземпляров модели."""
+        queryset = queryset.prefetch_related(None).values_list(*self.columns)
+        queryset._iterable_class = self.iterable_class
+        return queryset
+
+    def load_related(self, rows):
+        """Дочитывает обратные связи страницы строк."""
+        rows = list(rows)
+        if not rows or not self.related:
+            return rows
+        pks = [row.pk for row in rows]
+        for name, (remote, row_class, columns) in self.related.items():
+            related = defaultdict(RelatedRows)
+            values = remote.model.objects.filter(
+                **{f'{remote.attname}__in': pks}
+            ).order_by('pk').values_list(*columns)
+            for value in values:
+                related[value[1]].append(row_class(*value))
+            for row in rows:
+                setattr(row, name, related.get(row.pk, RelatedRows()))
+        return rows
+
+
+def get_model_field(model, name):
+    """Поле модели по имени, attname или имени обратной связи."""
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        pass
+    for relation in model._meta.related_objects:
+        if relation.get_accessor_name() == name:
+            return relation
+    return None
+
+
+def get_row_plan(serializer, extra=()):
+    """RowPlan для сериализатора или None, если строки не подходят.
+
+    `extra` - атрибуты модели, которые читает не сериализатор, а пагинация
+    (позиция курсора).
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    fields = [
+        field for field in serializer.fields.values()
+        if not field.write_only
+    ]
+    extra = tuple(extra)
+    key = (
+        type(serializer), tuple(field.field_name for field in fields), extra
+    )
+    if key not in _plans:
+        _plans[key] = build_row_plan(serializer.Meta.model, fields, extra)
+    return _plans[key]
+
+
+def build_row_plan(model, fields, extra):
+    # Атрибуты строки: столбцы, вложенные строки внешних ключей и
+    # обратные связи, которые дочитывает `RowPlan.load_related`.
+    columns = ['pk']
+    attributes = {'pk': 0}
+    nested = {}
+    related = {}
+
+    def add_column(column):
+        if column not in columns:
+            columns.append(column)
+        return columns.index(column)
+
+    for field in fields:
+        source, model_field = get_source_field(model, field)
+        if model_field is None:
+            return None
+        if not model_field.concrete:
+            related[source] = get_related_rows(model_field)
+        elif not model_field.is_relation or source == model_field.attname:
+            attributes[source] = add_column(model_field.attname)
+        elif isinstance(field, serializers.SlugRelatedField):
+            nested[source] = (
+                model_field,
+                field.slug_field,
+                add_column(f'{source}__{field.slug_field}'),
+                add_column(model_field.attname),
+            )
+        else:
+            return None
+    for name in extra:
+        model_field = get_model_field(model, name)
+        if model_field is None or not model_field.concrete:
+            return None
+        attributes.setdefault(
+            model_field.attname, add_column(model_field.attname)
+        )
+
+    return RowPlan(
+        columns, compile_make_row(model, attributes, nested, related), related
+    )
+
+
+def get_source_field(model, field):
+    """Атрибут и поле модели для поля сериализатора или (None, None).
+
+    Поддерживаются столбцы модели, внешние ключи и обратные связи
+    один-ко-многим.
+    """
+    if field.source == '*' or len(field.source_attrs) != 1:
+        return None, None
+    source = field.source_attrs[0]
+    model_field = get_model_field(model, source)
+    if model_field is None or model_field.many_to_many or not (
+        model_field.concrete or model_field.one_to_many
+    ):
+        return None, None
+    return source, model_field
+
+
+def get_related_rows(relation):
+    """Класс и столбцы строк обратной связи: pk, внешний ключ, остальные."""
+    remote = relation.remote_field
+    names = [
+        'pk', remote.attname, *(
+            field.attname for field in
+            relation.related_model._meta.concrete_fields
+            if not field.primary_key and field is not remote
+        )
+    ]
+    return remote, make_row_class(relation.related_model, names), names
+
+
+def compile_make_row(model, attributes, nested, related):
+    """Функция, которая собирает строку из кортежа values_list."""
+    namespace = {}
+    arguments = [f'values[{index}]' for index in attributes.values()]
+    for name, (model_field, slug_field, index, id_index) in nested.items():
+        row_class = f'{name}_row'
+        namespace[row_class] = make_row_class(
+            model_field.related_model, [slug_field]
+        )
+        arguments.append(
+            f'None if values[{id_index}] is None '
+            f'else {row_class}(values[{index}])'
+        )
+    namespace['row_class'] = make_row_class(
+        model, [*attributes, *nested], related
+    )
+    exec(
+        'def make_row(values):\n    return row_class({})\n'.format(
+            ', '.join(arguments)
+        ),
+        namespace
+    )
+    return namespace['make_row']
@@ -2,17 +2,49 @@ import re
 
 from django.contrib.auth.tokens import default_token_generator
 from django.core.validators import RegexValidator
+from django.db import transaction
 from rest_framework import serializers, status
 from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.generics import get_object_or_404
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainSerializer
 
+from api.identity import get_request_object
+from api.lookups import category_lookup, genre_lookup
+from api.signals import titles_bulk_created
 from api.utils import send_code_to_mail
-from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, TitleTrigram)
 from users.models import CustomUser
 
 USERNAME_REGEX = r'^[\w.@+-]+$'
+TITLES_BULK_MAX_ITEMS = 5000
+
+
+class SparseFieldsSerializerMixin:
+    """Отбор полей по `fields` и `expand` из контекста сериализатора.
+
+    Поля из `Meta.expandable_fields` выводятся, только если перечислены в
+    `expand`. Вложенные сериализаторы не изменяются.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if parent is not None and not (
+            isinstance(parent, serializers.ListSerializer)
+            and parent.parent is None
+        ):
+            return fields
+        expand = self.context.get('expand', ())
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                fields.pop(name, None)
+        only = self.context.get('fields')
+        if only:
+            for name in list(fields):
+                if name not in only:
+                    del fields[name]
+        return fields
 
 
 class UserRegistrationSerializer(serializers.Serializer):
@@ -113,7 +145,8 @@ class CustomTokenObtainSerializer(TokenObtainSerializer):
         return {'token': str(self.get_token(self.user).access_token)}
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(SparseFieldsSerializerMixin,
+                           serializers.ModelSerializer):
     """Сериализатор для пользовательской модели."""
 
     username = serializers.CharField(
@@ -137,7 +170,8 @@ class CustomUserSerializer(serializers.ModelSerializer):
         model = CustomUser
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsSerializerMixin,
+                         serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
     name = serializers.CharField(
@@ -156,7 +190,8 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для жанров."""
 
     name = serializers.CharField(
@@ -186,39 +221,151 @@ class TitleGenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Поле slug, которое находит объект в кэше справочника."""
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        # Объект попадёт во внешний ключ, поэтому версия справочника
+        # сверяется с БД раз за запрос: удалённый в другом процессе объект
+        # не должен найтись.
+        checked = self.context.setdefault('checked_lookups', set())
+        if self.lookup not in checked:
+            self.lookup.ensure_fresh(max_age=0)
+            checked.add(self.lookup)
+        obj = self.lookup.get_by_slug(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return obj
+
+
+class CachedCategoryField(serializers.Field):
+    """Категория произведения по `category_id` из кэша справочника."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs['source'] = 'category_id'
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return category_lookup.get_representation(value, CategorySerializer)
+
+
+class CachedGenreField(serializers.Field):
+    """Жанры произведения по строкам `TitleGenre` из кэша справочника."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs['source'] = 'titlegenre_set'
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.represent_ids(row.genre_id for row in value.all())
+
+    def represent_ids(self, genre_ids):
+        genres = (
+            genre_lookup.get_representation(genre_id, GenreSerializer)
+            for genre_id in genre_ids
+        )
+        return [genre for genre in genres if genre is not None]
+
+    def get_fast_values(self, pks):
+        """Жанры страницы произведений одним запросом (см. `api.fast`)."""
+        genre_ids = {pk: [] for pk in pks}
+        rows = TitleGenre.objects.filter(title_id__in=pks).order_by(
+            'pk'
+        ).values_list('title_id', 'genre_id')
+        for title_id, genre_id in rows:
+            genre_ids[title_id].append(genre_id)
+        return {pk: self.represent_ids(ids) for pk, ids in genre_ids.items()}
+
+
+class TitleReadSerializer(SparseFieldsSerializerMixin,
+                          serializers.ModelSerializer):
     """Сериализатор для чтения информации о названии."""
 
-    category = CategorySerializer(read_only=True)
-    genre = GenreSerializer(
-        read_only=True,
-        many=True
-    )
+    category = CachedCategoryField()
+    genre = CachedGenreField()
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'name_key',
+                   'reviews_modified')
         model = Title
 
 
+class TitleListSerializer(serializers.ListSerializer):
+    """Создание списка произведений одной транзакцией.
+
+    Slug жанров и категорий берутся из кэша справочников, произведения и
+    связи с жанрами записываются через bulk_create.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and len(data) > TITLES_BULK_MAX_ITEMS:
+            raise ValidationError({
+                'non_field_errors': [
+                    f'Не больше {TITLES_BULK_MAX_ITEMS} произведений '
+                    'за запрос.'
+                ]
+            })
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        titles = []
+        genres = []
+        for item in validated_data:
+            item = dict(item)
+            genres.append(item.pop('genre'))
+            titles.append(Title(**item))
+        with transaction.atomic():
+            titles = Title.objects.bulk_create_with_pks(titles)
+            TitleGenre.objects.bulk_create(
+                (
+                    TitleGenre(title_id=title.pk, genre_id=genre.pk)
+                    for title, title_genres in zip(titles, genres)
+                    for genre in title_genres
+                ),
+                batch_size=1000
+            )
+            TitleTrigram.objects.create_for(titles)
+            titles_bulk_created(titles)
+        for title, title_genres in zip(titles, genres):
+            # Жанры уже известны, поэтому ответ не перечитывает их из БД.
+            queryset = title.genre.all()
+            queryset._result_cache = list(title_genres)
+            queryset._prefetch_done = True
+            title._prefetched_objects_cache = {'genre': queryset}
+        return titles
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор для записи информации о названии."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
+    genre = CachedSlugRelatedField(
+        lookup=genre_lookup,
         queryset=Genre.objects.all(),
         many=True
     )
-    category = serializers.SlugRelatedField(
-        slug_field='slug',
+    category = CachedSlugRelatedField(
+        lookup=category_lookup,
         queryset=Category.objects.all())
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'rating', 'name_key',
+                   'reviews_modified')
         model = Title
+        list_serializer_class = TitleListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для отзывов."""
 
     title = serializers.SlugRelatedField(
@@ -241,20 +388,22 @@ class ReviewSerializer(serializers.ModelSerializer):
         request = self.context['request']
         author = request.user
         title_id = self.context.get('view').kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
+        title = get_request_object(request, Title, pk=title_id)
         if (
                 request.method == 'POST'
-                and title.reviews.filter(author=author).exists()
+                and title.reviews.filter(author_id=author.id).exists()
         ):
             raise ValidationError('Может существовать только один отзыв!')
         return data
 
     class Meta:
-        fields = '__all__'
+        exclude = ('comments_modified',)
         model = Review
+        expandable_fields = ('title',)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для комментариев."""
 
     review = serializers.SlugRelatedField(
@@ -269,3 +418,4 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = ('id', 'author', 'review', 'text', 'pub_date')
         model = Comment
+        expandable_fields = ('review',)
@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.autocomplete import title_autocomplete_index
+from api.catalog import catalog_engine
+from api.lookups import category_lookup, genre_lookup
+from reviews.models import (Category, Genre, Review, TableVersion, Title,
+                            TitleGenre)
+from reviews.signals import catalog_loaded
+
+
+def refresh_title(title_id):
+    # Рейтинг пересчитывается в той же транзакции, поэтому индексы
+    # перечитывают произведение только после её фиксации.
+    def refresh():
+        title_autocomplete_index.refresh(title_id)
+        catalog_engine.mark_dirty(title_id)
+
+    transaction.on_commit(refresh)
+
+
+def titles_bulk_created(titles):
+    """Обновляет индексы и версии после bulk_create без сигналов."""
+    TableVersion.objects.bump(Title, TitleGenre)
+    rows = [(title.pk, title.name, None, 0) for title in titles]
+
+    def refresh():
+        title_autocomplete_index.add_many(rows)
+        catalog_engine.clear()
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    refresh_title(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    refresh_title(instance.title_id)
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_changed(sender, instance, **kwargs):
+    if instance.title_id is not None:
+        refresh_title(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        refresh_title(instance.pk)
+    elif pk_set:
+        for title_id in pk_set:
+            refresh_title(title_id)
+    else:
+        transaction.on_commit(catalog_engine.clear)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def category_genre_changed(sender, instance, **kwargs):
+    lookup = category_lookup if sender is Category else genre_lookup
+    transaction.on_commit(lookup.clear)
+    transaction.on_commit(catalog_engine.clear)
+
+
+@receiver(catalog_loaded)
+def catalog_reloaded(sender, models, **kwargs):
+    def refresh():
+        title_autocomplete_index.clear()
+        catalog_engine.clear()
+        category_lookup.clear()
+        genre_lookup.clear()
+
+    transaction.on_commit(refresh)
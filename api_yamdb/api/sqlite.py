@@ -0,0 +1,19 @@
+"""Настройка соединений с SQLite.
+
+При каждом новом соединении выполняются PRAGMA из настройки
+`SQLITE_PRAGMAS`. Журнал WAL позволяет читать во время записи, а
+`busy_timeout` заставляет конкурирующую запись ждать блокировку вместо
+ошибки "database is locked". Запросы выполняются напрямую через
+sqlite3 и не попадают в `connection.queries`.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -1,11 +1,11 @@
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
-from django.db.models import Avg
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import CreateModelMixin
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
@@ -13,17 +13,26 @@ from rest_framework.permissions import (AllowAny, IsAuthenticated,
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from api.filter import TitleFilter
-from api.mixins import CategoryGenreMixin
+from api.autocomplete import title_autocomplete_index
+from api.catalog import catalog_engine
+from api.export import EXPORT_FORMATS, iter_titles
+from api.filter import KeysetOrderingFilter, SearchKeyFilter, TitleFilter
+from api.identity import get_request_object
+from api.mixins import (CategoryGenreMixin, ConditionalGetMixin,
+                        FastListMixin, ResponseCacheMixin,
+                        SparseFieldsMixin)
+from api.pagination import PubDatePagination, TitlePagination
 from api.permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorModeratorAdmin
 from api.serializers import (CategorySerializer, CommentSerializer,
                              CustomTokenObtainSerializer, CustomUserSerializer,
                              GenreSerializer, ReviewSerializer,
                              TitleReadSerializer, TitleWriteSerializer,
                              UserRegistrationSerializer)
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Genre, Review, Title, TitleGenre
 from users.models import CustomUser
 
+AUTOCOMPLETE_MAX_LIMIT = 50
+
 
 @method_decorator(csrf_exempt, name='dispatch')
 class UserRegistrationViewSet(CreateModelMixin, viewsets.GenericViewSet):
@@ -47,13 +56,13 @@ class TokenObtainView(TokenObtainPairView):
     serializer_class = CustomTokenObtainSerializer
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet для управления пользовательскими данными."""
 
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('username',)
+    filter_backends = (SearchKeyFilter,)
+    search_fields = ('username_key',)
     permission_classes = (
         IsAuthenticated,
         IsAdmin,
@@ -81,6 +90,8 @@ class CategoryViewSet(CategoryGenreMixin):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
+    cache_name = 'categories'
 
 
 class GenreViewSet(CategoryGenreMixin):
@@ -88,17 +99,24 @@ class GenreViewSet(CategoryGenreMixin):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
+    cache_name = 'genres'
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(ResponseCacheMixin, SparseFieldsMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     """ViewSet для управления произведениями."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).all()
+    queryset = Title.objects.prefetch_related(
+        'titlegenre_set'
+    ).order_by('pk')
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, KeysetOrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('id', 'year', 'rating')
+    pagination_class = TitlePagination
+    cache_models = (Title, TitleGenre, Category, Genre, Review)
+    cache_name = 'titles'
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_serializer_class(self):
@@ -106,41 +124,134 @@ class TitlesViewSet(viewsets.ModelViewSet):
             return TitleReadSerializer
         return TitleWriteSerializer
 
-
-class CommentViewSet(viewsets.ModelViewSet):
+    def create(self, request, *args, **kwargs):
+        """Создаёт одно произведение или список произведений."""
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def list(self, request, *args, **kwargs):
+        title_ids = None
+        if settings.CATALOG_ENGINE:
+            title_ids = catalog_engine.filter(request.query_params)
+        if title_ids is None:
+            return super().list(request, *args, **kwargs)
+
+        page = [int(pk) for pk in self.paginate_queryset(title_ids)]
+        compiled = self.get_compiled_serializer()
+        if compiled is not None:
+            rows = {
+                row.pk: row for row in
+                compiled.values(self.get_queryset().filter(pk__in=page))
+            }
+            return self.get_paginated_response(compiled.represent(
+                rows[pk] for pk in page if pk in rows
+            ))
+        plan = self.get_row_plan()
+        if plan is not None:
+            titles = {
+                row.pk: row for row in plan.load_related(
+                    plan.values(self.get_queryset().filter(pk__in=page))
+                )
+            }
+        else:
+            titles = self.trim_queryset(self.get_queryset()).in_bulk(page)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in page if pk in titles], many=True
+        )
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=('get',))
+    def autocomplete(self, request):
+        """Подсказки по началу слов названия из индекса в памяти."""
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 10
+        limit = min(max(limit, 1), AUTOCOMPLETE_MAX_LIMIT)
+        titles = title_autocomplete_index.search(
+            request.query_params.get('q', ''), limit
+        )
+        return Response([
+            {
+                'id': pk,
+                'name': name,
+                'rating': int(rating) if rating is not None else None
+            }
+            for pk, name, rating, _ in titles
+        ])
+
+    @action(detail=False, methods=('get',), permission_classes=(IsAdmin,))
+    def export(self, request):
+        """Потоковая выгрузка всего каталога: `?type=ndjson` или `csv`."""
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in EXPORT_FORMATS:
+            return Response(
+                {'type': [f'Допустимые значения: '
+                          f'{", ".join(EXPORT_FORMATS)}.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        render, content_type = EXPORT_FORMATS[export_type]
+        response = StreamingHttpResponse(
+            render(iter_titles()), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{export_type}"'
+        )
+        return response
+
+
+class CommentViewSet(ConditionalGetMixin, SparseFieldsMixin,
+                     FastListMixin, viewsets.ModelViewSet):
     """ViewSet для управления комментариями."""
 
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorModeratorAdmin,)
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
+        return get_request_object(
+            self.request, Review,
+            pk=self.kwargs.get('review_id'),
             title_id=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related(
+            'author'
+        ).order_by('pub_date', 'id')
+
+    def get_last_modified(self):
+        return self.get_review().comments_modified
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, SparseFieldsMixin,
+                    FastListMixin, viewsets.ModelViewSet):
     """ViewSet для управления отзывами."""
 
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorModeratorAdmin)
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_title(self):
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'))
+        return get_request_object(
+            self.request, Title, pk=self.kwargs.get('title_id')
+        )
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related(
+            'author'
+        ).order_by('pub_date', 'id')
+
+    def get_last_modified(self):
+        return self.get_title().reviews_modified
 
     def perform_create(self, serializer):
         author = self.request.user
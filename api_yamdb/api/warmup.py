@@ -0,0 +1,75 @@
+"""Прогрев процесса перед запуском воркеров (команда `serve`).
+
+Всё, что Django и DRF создают лениво при первом запросе (URL-резолвер,
+поля сериализаторов, формы фильтров, классы из настроек DRF), а также
+справочники и индексы в памяти создаются в главном процессе до fork.
+Воркеры получают их в общих страницах памяти, и первый запрос к воркеру
+обслуживается так же быстро, как последующие.
+"""
+import inspect
+import sys
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+from rest_framework import serializers
+
+from api.autocomplete import title_autocomplete_index
+from api.catalog import catalog_engine
+from api.filter import TitleFilter
+from api.lookups import category_lookup, genre_lookup
+from reviews.models import Title
+
+# Запросы, которые проходят весь путь обработки: middleware, рендереры,
+# пагинацию и кэш ответов.
+WARM_UP_URLS = (
+    '/api/v1/categories/',
+    '/api/v1/genres/',
+    '/api/v1/titles/',
+    '/api/v1/titles/?genre=&category=&ordering=-rating',
+)
+
+
+def warm_up(application):
+    """Готовит процесс к fork."""
+    # Импорт urlconf и разбор шаблонов URL.
+    get_resolver().reverse_dict
+    build_serializers()
+    TitleFilter(queryset=Title.objects.none()).form
+    category_lookup.ensure_fresh()
+    genre_lookup.ensure_fresh()
+    title_autocomplete_index.ensure_loaded()
+    if settings.CATALOG_ENGINE and catalog_engine.available:
+        catalog_engine.ensure_loaded()
+    for url in WARM_UP_URLS:
+        request(application, url)
+    # Соединение с БД нельзя разделять между процессами.
+    connections.close_all()
+
+
+def build_serializers():
+    """Строит поля всех сериализаторов API."""
+    module = sys.modules['api.serializers']
+    for serializer_class in vars(module).values():
+        if (
+            inspect.isclass(serializer_class)
+            and issubclass(serializer_class, serializers.Serializer)
+            and serializer_class.__module__ == module.__name__
+        ):
+            serializer_class().fields
+
+
+def request(application, url):
+    path, _, query = url.partition('?')
+    environ = {
+        'PATH_INFO': path, 'QUERY_STRING': query,
+        'wsgi.input': BytesIO(),
+    }
+    setup_testing_defaults(environ)
+    response = application(environ, lambda status, headers: None)
+    try:
+        b''.join(response)
+    finally:
+        response.close()
@@ -0,0 +1,57 @@
+"""Middleware, которые пропускают запросы к API.
+
+API аутентифицируется по JWT и не использует сессии, CSRF-токены,
+сообщения и заголовок X-Frame-Options. Классы ниже - наследники
+стандартных middleware Django: для путей из `LEAN_MIDDLEWARE_PATHS`
+запрос сразу передаётся дальше по цепочке, для остальных (админка)
+работает исходный класс.
+"""
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import clickjacking, csrf
+
+# Хуки, которые вызываются отдельно от цепочки и пропускаются возвратом None.
+HOOKS = ('process_view', 'process_exception')
+
+
+def skip_lean_paths(middleware_class):
+    """Наследник middleware, который не обрабатывает запросы к API."""
+
+    def __init__(self, get_response):
+        middleware_class.__init__(self, get_response)
+        self.lean_paths = tuple(settings.LEAN_MIDDLEWARE_PATHS)
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.lean_paths):
+            return self.get_response(request)
+        return middleware_class.__call__(self, request)
+
+    namespace = {'__init__': __init__, '__call__': __call__}
+    for name in HOOKS:
+        if hasattr(middleware_class, name):
+            namespace[name] = skip_hook(getattr(middleware_class, name))
+    return type(middleware_class.__name__, (middleware_class,), {
+        **namespace,
+        '__module__': __name__,
+        '__doc__': f'`{middleware_class.__name__}` только вне API.',
+    })
+
+
+def skip_hook(hook):
+    def wrapper(self, request, *args, **kwargs):
+        if request.path_info.startswith(self.lean_paths):
+            return None
+        return hook(self, request, *args, **kwargs)
+
+    return wrapper
+
+
+SessionMiddleware = skip_lean_paths(sessions.SessionMiddleware)
+CsrfViewMiddleware = skip_lean_paths(csrf.CsrfViewMiddleware)
+AuthenticationMiddleware = skip_lean_paths(auth.AuthenticationMiddleware)
+MessageMiddleware = skip_lean_paths(messages.MessageMiddleware)
+XFrameOptionsMiddleware = skip_lean_paths(
+    clickjacking.XFrameOptionsMiddleware
+)
@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -30,16 +31,20 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
 ]
 
+# Сессии, CSRF, сообщения и X-Frame-Options не работают для путей из
+# LEAN_MIDDLEWARE_PATHS (api_yamdb/middleware.py): API использует JWT.
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api_yamdb.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api_yamdb.middleware.CsrfViewMiddleware',
+    'api_yamdb.middleware.AuthenticationMiddleware',
+    'api_yamdb.middleware.MessageMiddleware',
+    'api_yamdb.middleware.XFrameOptionsMiddleware',
 ]
 
+LEAN_MIDDLEWARE_PATHS = ('/api/v1/',)
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -59,15 +64,52 @@ TEMPLATES = [
     },
 ]
 
+# Профиль узлов, которые обслуживают только API: без админки,
+# import_export, сессий и сообщений. Процесс запускается быстрее, потому
+# что эти приложения и их зависимости не импортируются.
+API_ONLY = os.getenv('API_ONLY', 'false').lower() == 'true'
+if API_ONLY:
+    ADMIN_APPS = (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'import_export',
+    )
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_APPS]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+        'django.contrib.messages.context_processors.messages'
+    )
+
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение переиспользуется запросами потока в течение
+        # CONN_MAX_AGE секунд, 0 - новое соединение на каждый запрос.
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 60)),
     }
 }
 
+# PRAGMA для каждого нового соединения с SQLite (api/sqlite.py).
+SQLITE_PRAGMAS = {
+    # Читатели не блокируют запись и наоборот.
+    'journal_mode': 'WAL',
+    # С WAL безопасно: при сбое питания теряется только последняя запись.
+    'synchronous': 'NORMAL',
+    # Ожидание блокировки записи в миллисекундах.
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение - размер кэша страниц в КБ.
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -116,6 +158,68 @@ REST_FRAMEWORK = {
     ]
 }
 
+# JSON через orjson (api/renderers.py); без orjson работает как DRF.
+if os.getenv('FAST_JSON', 'false').lower() == 'true':
+    JSON_RENDERER = 'api.renderers.FastJSONRenderer'
+    JSON_PARSER = 'api.renderers.FastJSONParser'
+else:
+    JSON_RENDERER = 'rest_framework.renderers.JSONRenderer'
+    JSON_PARSER = 'rest_framework.parsers.JSONParser'
+
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+    JSON_RENDERER,
+    'rest_framework.renderers.BrowsableAPIRenderer',
+]
+REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+    JSON_PARSER,
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+
+# MessagePack для внутренних сервисов (Accept: application/msgpack).
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
+        'api.renderers.MessagePackRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append(
+        'api.renderers.MessagePackParser'
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # При переполнении LocMemCache вытесняет давно не читанные записи.
+    'api': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-responses',
+        'OPTIONS': {'MAX_ENTRIES': 5000, 'CULL_FREQUENCY': 10},
+    },
+}
+
+# Кэш ответов на анонимные GET-запросы к каталогу (api/cache.py).
+API_CACHE = {
+    'ENABLED': os.getenv('API_CACHE', 'true').lower() == 'true',
+    'ALIAS': 'api',
+    'TIMEOUTS': {
+        'titles': 60,
+        'categories': 300,
+        'genres': 300,
+    },
+}
+
+# Колоночный движок чтения каталога в памяти (api/catalog.py), нужен NumPy.
+CATALOG_ENGINE = os.getenv('CATALOG_ENGINE', 'false').lower() == 'true'
+
+# Сериализация списков через скомпилированные функции (api/fast.py).
+FAST_SERIALIZERS = (
+    os.getenv('FAST_SERIALIZERS', 'false').lower() == 'true'
+)
+
+# Списки через строки со `__slots__` вместо экземпляров моделей
+# (api/rows.py); при FAST_SERIALIZERS используется скомпилированный путь.
+ROW_READS = os.getenv('ROW_READS', 'false').lower() == 'true'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=365),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -1,9 +1,8 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
 from django.views.generic import TemplateView
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path(
         'redoc/',
         TemplateView.as_view(template_name='redoc.html'),
@@ -11,3 +10,9 @@ urlpatterns = [
     ),
     path('api/v1/', include('api.urls'))
 ]
+
+# В профиле API_ONLY админка не установлена.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
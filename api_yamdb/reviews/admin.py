@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.db.models import Avg
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 
@@ -75,9 +74,7 @@ class TitleAdmin(ImportExportModelAdmin):
     get_genres.short_description = 'Жанр'
 
     def get_rating(self, obj):
-        reviews = obj.review_set.all()
-        average_score = reviews.aggregate(Avg('score'))['score__avg']
-        return round(average_score) if average_score is not None else None
+        return round(obj.rating) if obj.rating is not None else None
 
     get_rating.short_description = 'Рэйтинг'
 
@@ -0,0 +1,79 @@
+import unicodedata
+
+from django.db import models
+
+# Символ, больший любого другого: строки с префиксом `key` лежат
+# в диапазоне [key, key + PREFIX_UPPER_BOUND).
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+def normalize_search_key(value):
+    """Приводит строку к ключу поиска без учёта регистра (в т.ч. кириллицы)."""
+    return ' '.join(unicodedata.normalize('NFKC', value).casefold().split())
+
+
+class SearchKeyField(models.CharField):
+    """Индексируемый ключ поиска, вычисляемый из поля `source` при сохранении.
+
+    Значения в запросах нормализуются так же, как при записи, поэтому
+    `filter(name_key='ШОУШЕНК')` и `filter(name_key__prefix='шоу')`
+    работают без учёта регистра и используют индекс.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        if kwargs.get('editable') is False:
+            del kwargs['editable']
+        if kwargs.get('db_index') is True:
+            del kwargs['db_index']
+        else:
+            kwargs['db_index'] = False
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = normalize_search_key(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return value
+        return normalize_search_key(value)
+
+
+@SearchKeyField.register_lookup
+class Prefix(models.Lookup):
+    """Поиск по префиксу через диапазон значений, а не через LIKE."""
+
+    lookup_name = 'prefix'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        upper_params = [param + PREFIX_UPPER_BOUND for param in rhs_params]
+        return (
+            f'({lhs} >= {rhs} AND {lhs} < {rhs})',
+            lhs_params + rhs_params + lhs_params + upper_params
+        )
+
+
+class FullTextField(models.TextField):
+    """Скрытый столбец FTS5-таблицы, по которому выполняется MATCH."""
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
@@ -0,0 +1,298 @@
+import csv
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, TitleTrigram)
+from reviews.search import FTS_TRIGGERS, ensure_title_fts
+from reviews.signals import catalog_loaded
+from users.models import CustomUser
+
+# Файлы в порядке внешних ключей: каждый ссылается только на предыдущие.
+CSV_FILES = (
+    ('users', CustomUser),
+    ('category', Category),
+    ('genre', Genre),
+    ('titles', Title),
+    ('genre_title', TitleGenre),
+    ('review', Review),
+    ('comments', Comment),
+)
+# Большие таблицы без вычисляемых полей пишутся через executemany:
+# сборка SQL в bulk_create обходится дороже самой вставки.
+RAW_INSERT_MODELS = (TitleGenre, Review, Comment)
+
+
+INTEGER_FIELDS = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField',
+    'BigIntegerField', 'SmallIntegerField', 'PositiveIntegerField',
+    'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+}
+TEXT_FIELDS = {'CharField', 'TextField', 'SlugField', 'EmailField'}
+
+
+def get_fields(model, columns):
+    """Поля модели для колонок CSV: `author` -> `author_id` и т.п."""
+    return [model._meta.get_field(column) for column in columns]
+
+
+def convert(field, value):
+    if value == '' and field.null:
+        return None
+    return field.to_python(value)
+
+
+def get_datetime_converter():
+    # Атрибуты соединения читаются один раз: прокси `connection` медленный.
+    db_timezone = connection.timezone
+    adapt = connection.ops.adapt_datetimefield_value
+
+    def to_db(value):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if settings.USE_TZ:
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            value = value.astimezone(db_timezone).replace(tzinfo=None)
+        return adapt(value)
+
+    return to_db
+
+
+def get_db_converter(field):
+    """Функция, переводящая строку CSV сразу в значение для БД."""
+    target = field.target_field if field.is_relation else field
+    internal_type = target.get_internal_type()
+    if internal_type in INTEGER_FIELDS:
+        to_db = int
+    elif internal_type in TEXT_FIELDS:
+        return str
+    elif internal_type == 'DateTimeField':
+        to_db = get_datetime_converter()
+    else:
+        def to_db(value):
+            return field.get_db_prep_save(field.to_python(value), connection)
+    if not field.null:
+        return to_db
+    return lambda value: None if value == '' else to_db(value)
+
+
+class Command(BaseCommand):
+    """Быстрая загрузка CSV из static/data через bulk_create."""
+
+    help = (
+        'Загружает CSV-файлы (users, category, genre, titles, genre_title, '
+        'review, comments) пачками через bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*', metavar='file',
+            help='Имена файлов без .csv, по умолчанию все.'
+        )
+        parser.add_argument(
+            '--path', default=settings.BASE_DIR / 'static' / 'data',
+            help='Папка с CSV-файлами.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Удалить записи загружаемых таблиц перед загрузкой.'
+        )
+        parser.add_argument(
+            '--drop-indexes', action='store_true',
+            help='Удалить неуникальные индексы на время загрузки (SQLite).'
+        )
+
+    def handle(self, *args, **options):
+        names = options['files'] or [name for name, _ in CSV_FILES]
+        unknown = set(names) - {name for name, _ in CSV_FILES}
+        if unknown:
+            raise CommandError(f'Неизвестные файлы: {", ".join(unknown)}')
+        files = [
+            (name, model) for name, model in CSV_FILES if name in names
+        ]
+        models = [model for _, model in files]
+        started = time.perf_counter()
+        total = 0
+        with transaction.atomic():
+            if Title in models:
+                self.drop_fts_triggers()
+            if options['clear']:
+                self.clear(models)
+            indexes = []
+            if options['drop_indexes']:
+                indexes = self.drop_indexes(models)
+            for name, model in files:
+                path = Path(options['path']) / f'{name}.csv'
+                total += self.load(path, model, options['batch_size'])
+            self.create_indexes(indexes)
+            self.reset_sequences(models)
+            self.finish(models)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {total} записей за {elapsed:.1f} с '
+            f'({total / elapsed:.0f} записей/с)'
+        ))
+
+    def load(self, path, model, batch_size):
+        started = time.perf_counter()
+        count = 0
+        with open(path, encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            fields = get_fields(model, next(reader))
+            insert = (
+                self.insert_rows if model in RAW_INSERT_MODELS
+                else self.create_objects
+            )
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    break
+                insert(model, fields, rows)
+                count += len(rows)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{path.name}: {count} записей за {elapsed:.1f} с '
+            f'({count / max(elapsed, 1e-9):.0f} записей/с)'
+        )
+        return count
+
+    @staticmethod
+    def create_objects(model, fields, rows):
+        """bulk_create для таблиц с вычисляемыми полями (ключи поиска)."""
+        objects = []
+        for row in rows:
+            values = {
+                field.attname: convert(field, value)
+                for field, value in zip(fields, row)
+            }
+            if model is CustomUser:
+                values['password'] = make_password(None)
+            objects.append(model(**values))
+        model.objects.bulk_create(objects)
+
+    @staticmethod
+    def insert_rows(model, fields, rows):
+        """Вставляет строки одним executemany.
+
+        Поля, которых нет в файле, получают значения по умолчанию, как при
+        создании объекта, а `auto_now_add` - время загрузки.
+        """
+        template = model()
+        defaults = [
+            field for field in model._meta.concrete_fields
+            if field not in fields and not field.primary_key
+        ]
+        default_values = [
+            field.get_db_prep_save(field.pre_save(template, True), connection)
+            for field in defaults
+        ]
+        columns = ', '.join(
+            connection.ops.quote_name(field.column)
+            for field in fields + defaults
+        )
+        placeholders = ', '.join(['%s'] * (len(fields) + len(defaults)))
+        table = connection.ops.quote_name(model._meta.db_table)
+        converters = [get_db_converter(field) for field in fields]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {table} ({columns}) VALUES ({placeholders})',
+                [
+                    [to_db(value) for to_db, value in zip(converters, row)]
+                    + default_values
+                    for row in rows
+                ]
+            )
+
+    def clear(self, models):
+        # Удаление через ORM отправляет сигналы для каждой строки, поэтому
+        # таблицы очищаются одним запросом в обратном порядке ключей.
+        tables = [model._meta.db_table for model in reversed(models)]
+        if Title in models:
+            tables.insert(tables.index(Title._meta.db_table),
+                          TitleTrigram._meta.db_table)
+        with connection.cursor() as cursor:
+            for table in tables:
+                table = connection.ops.quote_name(table)
+                cursor.execute(f'DELETE FROM {table}')
+
+    def drop_indexes(self, models):
+        """Удаляет неуникальные индексы таблиц и возвращает их SQL."""
+        if connection.vendor != 'sqlite':
+            self.stderr.write(
+                'Удаление индексов поддерживается только для SQLite.'
+            )
+            return []
+        tables = [model._meta.db_table for model in models]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                'AND sql IS NOT NULL AND tbl_name IN ({})'.format(
+                    ', '.join(['%s'] * len(tables))
+                ),
+                tables
+            )
+            indexes = [
+                (name, sql) for name, sql in cursor.fetchall()
+                if not sql.upper().startswith('CREATE UNIQUE')
+            ]
+            for name, _ in indexes:
+                name = connection.ops.quote_name(name)
+                cursor.execute(f'DROP INDEX {name}')
+        return [sql for _, sql in indexes]
+
+    def create_indexes(self, indexes):
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            for sql in indexes:
+                cursor.execute(sql)
+        if indexes:
+            self.stdout.write(
+                f'Индексы пересозданы за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+    def drop_fts_triggers(self):
+        # Индекс FTS5 перестраивается целиком после загрузки.
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            for name in FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def finish(self, models):
+        """Пересчитывает рейтинги и поисковые индексы произведений."""
+        started = time.perf_counter()
+        if Title in models or Review in models:
+            Title.objects.all().update_rating()
+        if Title in models:
+            TitleTrigram.objects.all().delete()
+            titles = Title.objects.only('id', 'name').order_by('pk')
+            batch = []
+            for title in titles.iterator(chunk_size=5000):
+                batch.append(title)
+                if len(batch) == 5000:
+                    TitleTrigram.objects.create_for(batch)
+                    batch = []
+            TitleTrigram.objects.create_for(batch)
+        ensure_title_fts(connection)
+        catalog_loaded.send(sender=self.__class__, models=models)
+        self.stdout.write(
+            f'Рейтинги и поисковые индексы обновлены за '
+            f'{time.perf_counter() - started:.1f} с'
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title, TitleTrigram
+
+
+class Command(BaseCommand):
+    """Пересоздаёт триграммы названий всех произведений."""
+
+    help = 'Пересоздаёт индекс нечёткого поиска по названиям произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        titles = Title.objects.only('id', 'name').order_by('pk')
+        with transaction.atomic():
+            TitleTrigram.objects.all().delete()
+            batch = []
+            for title in titles.iterator(chunk_size=batch_size):
+                batch.append(title)
+                if len(batch) == batch_size:
+                    TitleTrigram.objects.rebuild(batch)
+                    batch = []
+            TitleTrigram.objects.rebuild(batch)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Триграммы пересозданы для {titles.count()} произведений'
+            )
+        )
@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-18 16:52
+
+from django.db import migrations
+
+import reviews.fields
+
+
+def fill_name_keys(apps, schema_editor):
+    for model_name in ('Category', 'Genre', 'Title'):
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('name'))
+        for obj in objects:
+            obj.name_key = reviews.fields.normalize_search_key(obj.name)
+        model.objects.bulk_update(objects, ['name_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_key',
+            field=reviews.fields.SearchKeyField(default='', max_length=256, source='name', verbose_name='Ключ поиска'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_key',
+            field=reviews.fields.SearchKeyField(default='', max_length=256, source='name', verbose_name='Ключ поиска'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_key',
+            field=reviews.fields.SearchKeyField(default='', max_length=256, source='name', verbose_name='Ключ поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+    ]
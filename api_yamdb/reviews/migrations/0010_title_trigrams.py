@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 16:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+import reviews.search
+
+
+def fill_trigrams(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    TitleTrigram.objects.bulk_create(
+        (
+            TitleTrigram(title_id=pk, trigram=trigram)
+            for pk, name in Title.objects.values_list('pk', 'name').iterator()
+            for trigram in reviews.search.get_trigrams(name)
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_search_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3, verbose_name='Триграмма')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Триграмма названия',
+                'verbose_name_plural': 'Триграммы названий',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titletrigram',
+            constraint=models.UniqueConstraint(fields=('trigram', 'title'), name='unique_trigram_title'),
+        ),
+        migrations.RunPython(fill_trigrams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 17:03
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_trigrams'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_modified',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата изменения комментариев'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_modified',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата изменения отзывов'),
+        ),
+    ]
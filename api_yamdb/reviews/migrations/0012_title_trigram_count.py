@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 19:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_trigram_counts(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    Title.objects.update(trigram_count=Coalesce(
+        Subquery(
+            TitleTrigram.objects.filter(title=OuterRef('pk'))
+            .values('title').annotate(total=Count('pk')).values('total')
+        ),
+        0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_modified_dates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='trigram_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Число триграмм названия'),
+        ),
+        migrations.RunPython(fill_trigram_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2 on 2026-10-18 19:59
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_trigram_counts(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    TitleTrigram.objects.update(trigram_count=Subquery(
+        Title.objects.filter(pk=OuterRef('title')).values('trigram_count')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_table_version'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='titletrigram',
+            name='unique_trigram_title',
+        ),
+        migrations.AddField(
+            model_name='titletrigram',
+            name='trigram_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Число триграмм названия'),
+        ),
+        migrations.RunPython(fill_trigram_counts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='titletrigram',
+            constraint=models.UniqueConstraint(fields=('trigram', 'trigram_count', 'title'), name='unique_trigram_count_title'),
+        ),
+        migrations.RemoveField(
+            model_name='title',
+            name='trigram_count',
+        ),
+    ]
@@ -1,9 +1,21 @@
+import math
+
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.fields import FullTextField, SearchKeyField
+from reviews.search import get_trigrams
 
 User = get_user_model()
 
+# Частота триграммы для нечёткого поиска считается до этого числа названий:
+# дальше подсчёт дороже, чем выигрыш от точного порядка триграмм.
+FUZZY_FREQUENCY_CAP = 100000
+
 
 class Category(models.Model):
     """Модель 'Категория'."""
@@ -13,6 +25,11 @@ class Category(models.Model):
         verbose_name='Категория',
 
     )
+    name_key = SearchKeyField(
+        max_length=256,
+        source='name',
+        verbose_name='Ключ поиска'
+    )
     slug = models.SlugField(
         max_length=50,
         verbose_name='Слаг',
@@ -35,6 +52,11 @@ class Genre(models.Model):
         verbose_name='Жанр',
         unique=True
     )
+    name_key = SearchKeyField(
+        max_length=256,
+        source='name',
+        verbose_name='Ключ поиска'
+    )
     slug = models.SlugField(
         max_length=50,
         verbose_name='Слаг',
@@ -49,6 +71,60 @@ class Genre(models.Model):
         return self.name
 
 
+def get_update_fields(instance, excluded):
+    """Все изменяемые поля модели, кроме `excluded`."""
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in excluded
+    ]
+
+
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений."""
+
+    def update_rating(self, **fields):
+        """Пересчитывает хранимый рейтинг произведений по их отзывам.
+
+        `fields` обновляются тем же запросом.
+        """
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+            rating=Subquery(
+                reviews.annotate(average=Avg('score')).values('average')
+            ),
+            **fields
+        )
+
+    def bulk_create_with_pks(self, titles, batch_size=1000):
+        """Создаёт произведения через bulk_create и проставляет им id.
+
+        Django 3.2 не возвращает id из bulk_create на SQLite. Вставка идёт в
+        транзакции, которая держит блокировку записи SQLite, поэтому новые
+        строки - последние `len(titles)` id таблицы.
+        """
+        titles = list(titles)
+        with transaction.atomic(using=self.db, savepoint=False):
+            self.bulk_create(titles, batch_size=batch_size)
+            if titles and titles[0].pk is None:
+                pks = self.order_by('-pk').values_list(
+                    'pk', flat=True
+                )[:len(titles)]
+                for title, pk in zip(titles, reversed(list(pks))):
+                    title.pk = pk
+                    title._state.adding = False
+        return titles
+
+
 class Title(models.Model):
     """Модель 'Произведение'."""
 
@@ -56,6 +132,11 @@ class Title(models.Model):
                             verbose_name='Произведение',
                             help_text='Укажите название произведения'
                             )
+    name_key = SearchKeyField(
+        max_length=256,
+        source='name',
+        verbose_name='Ключ поиска'
+    )
     year = models.PositiveSmallIntegerField(
         verbose_name='Год произведения',
         help_text='Укажите год произведения',
@@ -80,14 +161,212 @@ class Title(models.Model):
         blank=True,
         help_text='Добавьте описание произведения'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        editable=False
+    )
+
+    reviews_modified = models.DateTimeField(
+        'Дата изменения отзывов',
+        default=timezone.now,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    # Поля, которые обновляются только при изменении отзывов.
+    REVIEW_FIELDS = ('rating_sum', 'rating_count', 'rating',
+                     'reviews_modified')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=('year', 'id')),
+            models.Index(fields=('rating', 'id')),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Рейтинг меняется только через update_rating(), поэтому сохранение
+        # ранее загруженного произведения не должно перезаписывать его.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = get_update_fields(
+                self, self.REVIEW_FIELDS
+            )
+        super().save(*args, **kwargs)
+
+
+class TitleSearch(models.Model):
+    """Полнотекстовый индекс SQLite FTS5 по названию и описанию.
+
+    Таблица создаётся миграцией и синхронизируется с `Title` триггерами.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search'
+    )
+    name = models.TextField()
+    description = models.TextField()
+    document = FullTextField(db_column='reviews_title_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_fts'
+
+
+class TitleTrigramQuerySet(models.QuerySet):
+    """QuerySet триграмм названий произведений."""
+
+    def rebuild(self, titles):
+        """Пересоздаёт триграммы для переданных произведений."""
+        titles = list(titles)
+        self.filter(title__in=titles).delete()
+        return self.create_for(titles)
+
+    def create_for(self, titles):
+        """Создаёт триграммы для новых произведений."""
+        trigrams = {title.pk: get_trigrams(title.name) for title in titles}
+        return self.bulk_create(
+            (
+                TitleTrigram(title_id=pk, trigram=trigram,
+                             trigram_count=len(title_trigrams))
+                for pk, title_trigrams in trigrams.items()
+                for trigram in title_trigrams
+            ),
+            batch_size=1000
+        )
+
+    def get_frequencies(self, trigrams, low, high, cap):
+        """Число названий с каждой триграммой, но не больше `cap`.
+
+        Считаются только названия, у которых от `low` до `high` триграмм.
+        Подсчёт ограничен, чтобы частые триграммы не читались целиком.
+        """
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        sql = ' UNION ALL '.join(
+            f'SELECT %s, (SELECT COUNT(*) FROM (SELECT 1 FROM {table} '
+            f'WHERE trigram = %s AND trigram_count BETWEEN %s AND %s '
+            f'LIMIT {int(cap)}))'
+            for _ in trigrams
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [
+                value for trigram in trigrams
+                for value in (trigram, trigram, low, high)
+            ])
+            return dict(cursor.fetchall())
+
+    def similar(self, value, threshold, limit):
+        """Возвращает пары (id произведения, сходство) по убыванию сходства.
+
+        Сходство s / (q + T - s), где s - общие триграммы, q и T - триграммы
+        запроса и названия (`trigram_count`), не меньше `threshold` только
+        при threshold * q <= T <= q / threshold: эта полоса читается
+        диапазоном индекса (trigram, trigram_count, title). Кроме того,
+        нужно s >= threshold * (q + T) / (1 + threshold). Из группировки
+        исключаются k < threshold * q самых частых триграмм запроса: у
+        подходящего названия есть хотя бы одна из остальных, а граница для
+        них меньше на k. Частые триграммы досчитываются только для
+        названий, прошедших эту границу, по полному ключу того же индекса,
+        всё одним запросом.
+        """
+        trigrams = get_trigrams(value)
+        if all(' ' in trigram for trigram in trigrams):
+            # В запросе нет слов длиннее двух букв: триграммы начала и
+            # конца слов совпадают с большой долей каталога.
+            return []
+        size = len(trigrams)
+        low = math.ceil(threshold * size)
+        high = math.floor(size / threshold)
+        frequencies = self.get_frequencies(
+            trigrams, low, high, FUZZY_FREQUENCY_CAP
+        )
+        trigrams = sorted(trigrams, key=lambda trigram: (
+            frequencies[trigram], trigram
+        ))
+        common_size = math.ceil(threshold * size) - 1
+        rare = trigrams[:size - common_size]
+        common = trigrams[size - common_size:]
+
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        common_placeholders = ', '.join(['%s'] * len(common)) or 'NULL'
+        rare_placeholders = ', '.join(['%s'] * len(rare))
+        sql = (
+            f'SELECT id, shared / (%s + total - shared) AS similarity FROM ('
+            f'SELECT title_id AS id, trigram_count AS total, '
+            f'(COUNT(*) + (SELECT COUNT(*) FROM {table} c '
+            f'WHERE c.trigram IN ({common_placeholders}) '
+            f'AND c.trigram_count = tt.trigram_count '
+            f'AND c.title_id = tt.title_id)) * 1.0 AS shared '
+            f'FROM {table} tt '
+            f'WHERE trigram IN ({rare_placeholders}) '
+            f'AND trigram_count BETWEEN %s AND %s '
+            f'GROUP BY title_id, trigram_count '
+            f'HAVING COUNT(*) >= %s * (%s + trigram_count) / %s - %s'
+            f') WHERE similarity >= %s '
+            f'ORDER BY similarity DESC, id LIMIT %s'
+        )
+        params = [
+            size, *common, *rare, low, high,
+            threshold, size, 1 + threshold, common_size, threshold, limit
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+class TitleTrigram(models.Model):
+    """Триграмма слова из названия произведения для нечёткого поиска."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='trigrams',
+        verbose_name='Произведение'
+    )
+    trigram = models.CharField('Триграмма', max_length=3)
+    trigram_count = models.PositiveSmallIntegerField(
+        'Число триграмм названия',
+        default=0,
+        editable=False
+    )
+
+    objects = TitleTrigramQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Триграмма названия'
+        verbose_name_plural = 'Триграммы названий'
+        # Число триграмм одинаково у всех строк произведения, поэтому
+        # уникальность не меняется, а индекс отдаёт полосу длин названий
+        # для каждой триграммы диапазоном.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['trigram', 'trigram_count', 'title'],
+                name='unique_trigram_count_title'
+            )
+        ]
+
 
 class TitleGenre(models.Model):
     """Модель 'Произведение - Жанр'."""
@@ -126,6 +405,11 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    comments_modified = models.DateTimeField(
+        'Дата изменения комментариев',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -136,6 +420,26 @@ class Review(models.Model):
                 name='unique_title_author'
             )
         ]
+        indexes = [
+            models.Index(fields=('title', 'pub_date', 'id')),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Дата изменения комментариев обновляется только при их изменении.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = get_update_fields(
+                self, ('comments_modified',)
+            )
+        # Рейтинг произведения обновляется в post_save, поэтому отзыв
+        # и рейтинг должны сохраняться в одной транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Comment(models.Model):
@@ -156,3 +460,54 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=('review', 'pub_date', 'id')),
+        ]
+
+
+class TableVersionQuerySet(models.QuerySet):
+
+    def get_version(self, model):
+        return self.get_versions([model])[0]
+
+    def get_versions(self, models):
+        """Версии таблиц моделей одним запросом, 0 - если записей не было."""
+        labels = [model._meta.label_lower for model in models]
+        versions = dict(
+            self.filter(table__in=labels).values_list('table', 'version')
+        )
+        return [versions.get(label, 0) for label in labels]
+
+    def bump(self, *models):
+        """Увеличивает версии таблиц одним запросом в текущей транзакции."""
+        if not models:
+            return
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self.model._meta.db_table)
+        name, version = quote_name('table'), quote_name('version')
+        values = ', '.join(['(%s, 1)'] * len(models))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({name}, {version}) VALUES {values} '
+                f'ON CONFLICT ({name}) '
+                f'DO UPDATE SET {version} = {version} + 1',
+                [model._meta.label_lower for model in models]
+            )
+
+
+class TableVersion(models.Model):
+    """Версия таблицы, общая для всех процессов.
+
+    По ней процессы узнают, что их копии данных (справочники, кэш
+    ответов) устарели.
+    """
+
+    table = models.CharField('Таблица', max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField('Версия', default=0)
+
+    objects = TableVersionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Версия таблицы'
+        verbose_name_plural = 'Версии таблиц'
@@ -0,0 +1,83 @@
+"""Поисковые индексы произведений.
+
+Полнотекстовый индекс: таблица SQLite FTS5 `reviews_title_fts` создаётся
+миграцией. При изменении схемы `reviews_title` SQLite пересоздаёт таблицу,
+и триггеры синхронизации теряются, поэтому после каждой миграции они
+восстанавливаются.
+
+Нечёткий поиск: триграммы слов названия хранятся в `TitleTrigram`,
+сходство считается как у pg_trgm - отношение общих триграмм ко всем.
+"""
+from django.db import connections
+
+from reviews.fields import normalize_search_key
+
+FTS_TABLE = 'reviews_title_fts'
+
+FTS_TRIGGERS = {
+    'reviews_title_fts_ai': (
+        'CREATE TRIGGER reviews_title_fts_ai AFTER INSERT ON reviews_title '
+        'BEGIN '
+        'INSERT INTO reviews_title_fts(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); END'
+    ),
+    'reviews_title_fts_ad': (
+        'CREATE TRIGGER reviews_title_fts_ad AFTER DELETE ON reviews_title '
+        'BEGIN '
+        'INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, '
+        "description) VALUES ('delete', old.id, old.name, old.description); "
+        'END'
+    ),
+    'reviews_title_fts_au': (
+        'CREATE TRIGGER reviews_title_fts_au AFTER UPDATE OF name, '
+        'description ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, '
+        "description) VALUES ('delete', old.id, old.name, old.description); "
+        'INSERT INTO reviews_title_fts(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); END'
+    ),
+}
+
+
+def ensure_title_fts(connection):
+    """Восстанавливает потерянные триггеры и перестраивает индекс."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            'AND name = %s', [FTS_TABLE]
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            'AND tbl_name = %s', ['reviews_title']
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [
+            sql for name, sql in FTS_TRIGGERS.items() if name not in existing
+        ]
+        if not missing:
+            return
+        for sql in missing:
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def restore_title_fts(sender, using, **kwargs):
+    ensure_title_fts(connections[using])
+
+
+def get_trigrams(value):
+    """Множество триграмм слов строки, дополненных пробелами как в pg_trgm."""
+    trigrams = set()
+    for word in normalize_search_key(value).split():
+        padded = f'  {word} '
+        trigrams.update(
+            padded[position:position + 3]
+            for position in range(len(padded) - 2)
+        )
+    return trigrams
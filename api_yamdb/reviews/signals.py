@@ -0,0 +1,75 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from reviews.models import (Category, Comment, Genre, Review, TableVersion,
+                            Title, TitleGenre, TitleTrigram)
+
+# Отправляется после массовой загрузки, которая не вызывает post_save.
+# Аргумент `models` - список загруженных моделей.
+catalog_loaded = Signal()
+
+VERSIONED_MODELS = (Category, Genre, Title, TitleGenre, Review)
+
+
+def update_title_rating(review):
+    """Обновляет рейтинг произведений, к которым относится отзыв."""
+    title_ids = {review.title_id, getattr(review, '_loaded_title_id', None)}
+    title_ids.discard(None)
+    Title.objects.filter(pk__in=title_ids).update_rating(
+        reviews_modified=timezone.now()
+    )
+    review._loaded_title_id = review.title_id
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    update_title_rating(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    update_title_rating(instance)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'name' in update_fields:
+        TitleTrigram.objects.rebuild([instance])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_modified=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def versioned_table_changed(sender, **kwargs):
+    # Версия меняется после записи строк и в той же транзакции: процесс,
+    # увидевший новую версию, увидит и новые строки.
+    TableVersion.objects.bump(sender)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def versioned_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        TableVersion.objects.bump(TitleGenre)
+
+
+@receiver(catalog_loaded)
+def versioned_tables_loaded(sender, models, **kwargs):
+    TableVersion.objects.bump(
+        *(model for model in models if model in VERSIONED_MODELS)
+    )
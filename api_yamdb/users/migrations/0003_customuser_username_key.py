@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 16:52
+
+from django.db import migrations
+
+import reviews.fields
+
+
+def fill_username_keys(apps, schema_editor):
+    CustomUser = apps.get_model('users', 'CustomUser')
+    users = list(CustomUser.objects.only('username'))
+    for user in users:
+        user.username_key = reviews.fields.normalize_search_key(user.username)
+    CustomUser.objects.bulk_update(users, ['username_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_customuser_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='username_key',
+            field=reviews.fields.SearchKeyField(default='', max_length=150, source='username', verbose_name='Ключ поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_username_keys, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from reviews.fields import SearchKeyField
+
 
 class CustomUser(AbstractUser):
     """Кастомная модель пользователя."""
@@ -15,6 +17,9 @@ class CustomUser(AbstractUser):
     ]
 
     username = models.CharField('Логин', max_length=150, unique=True)
+    username_key = SearchKeyField(
+        'Ключ поиска', max_length=150, source='username'
+    )
     email = models.EmailField('Почта', max_length=254, unique=True)
     first_name = models.CharField('Имя', max_length=150, blank=True)
     last_name = models.CharField('Фамилия', max_length=150, blank=True)
@@ -0,0 +1,57 @@
+"""Сравнение колоночного движка каталога с выборкой через ORM.
+
+    python benchmarks/catalog_engine.py --titles 100000
+"""
+import argparse
+
+from utils import create_catalog, measure, print_table, setup_django
+
+QUERIES = (
+    {},
+    {'page': 500},
+    {'category': 'movie'},
+    {'genre': 'genre-3', 'year': 1999},
+    {'genre': 'genre-1', 'category': 'book', 'ordering': '-rating'},
+    {'name': 'произведение 12'},
+    {'ordering': 'year', 'page': 200},
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django(CATALOG_ENGINE=False, ALLOWED_HOSTS=['*'])
+    from django.conf import settings
+    from django.test import Client
+
+    from api.catalog import catalog_engine
+
+    # Замеряется выборка, а не кэш ответов.
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    create_catalog(args.titles, reviews_per_title=1)
+    client = Client()
+    rows = []
+    for params in QUERIES:
+        def request():
+            response = client.get('/api/v1/titles/', params)
+            assert response.status_code == 200, response.content
+            return response
+
+        settings.CATALOG_ENGINE = False
+        orm = measure(request, args.repeat)
+        settings.CATALOG_ENGINE = True
+        catalog_engine.load()
+        engine = measure(request, args.repeat)
+        rows.append((
+            params or '-', f'{orm:.2f}', f'{engine:.2f}',
+            f'{orm / engine:.1f}x'
+        ))
+    print(f'Произведений: {args.titles}, медиана по {args.repeat} запросам')
+    print_table(('запрос', 'ORM, мс', 'движок, мс', 'ускорение'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Память и скорость потоковой выгрузки каталога.
+
+    python benchmarks/export.py --titles 10000 50000
+
+Пиковая память генератора не должна расти вместе с размером каталога.
+"""
+import argparse
+import time
+import tracemalloc
+
+from utils import create_catalog, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, nargs='+',
+                        default=[5000, 20000])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+
+    from api.export import EXPORT_FORMATS, iter_titles
+
+    rows = []
+    for size in args.titles:
+        call_command('flush', interactive=False, verbosity=0)
+        create_catalog(size, reviews_per_title=1)
+        for name, (render, _) in EXPORT_FORMATS.items():
+            tracemalloc.start()
+            started = time.perf_counter()
+            size_bytes = sum(len(line) for line in render(iter_titles()))
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            rows.append((
+                size, name, f'{size_bytes / 2 ** 20:.1f}',
+                f'{elapsed:.2f}', f'{peak / 2 ** 20:.1f}'
+            ))
+    print_table(
+        ('Произведений', 'Формат', 'Объём, МБ', 'Время, с', 'Пик, МБ'), rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Нечёткий поиск по названиям (`?fuzzy=`) на большом каталоге.
+
+    python benchmarks/fuzzy.py --titles 1000000 --database /tmp/fuzzy.sqlite3
+
+Названия из 1-4 слов собираются из слогов, частота слов убывает по закону
+Ципфа. Запросы - существующие названия с опечатками, одно частое слово и
+короткие строки. Заполнение миллиона произведений занимает несколько
+минут, поэтому базу можно сохранить в файл `--database` и переиспользовать.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from itertools import accumulate
+
+from utils import PROJECT_DIR, measure, print_table
+
+SYLLABLES = [
+    onset + vowel + coda
+    for onset in (*'бвгджзклмнпрстфхцчшщ', 'бр', 'вл', 'гр', 'др', 'кл',
+                  'кр', 'пл', 'пр', 'ст', 'тр', 'сл', 'зв', 'шк', 'хр')
+    for vowel in 'аеёиоуыэюя'
+    for coda in ('', *'йклмнрст')
+]
+
+
+def setup_django(database):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    django.setup()
+    settings.DEBUG = False
+    settings.API_CACHE['ENABLED'] = False
+    connection.settings_dict['NAME'] = database
+    call_command('migrate', verbosity=0)
+
+
+def make_words(rnd, count):
+    words = set()
+    while len(words) < count:
+        words.add(''.join(
+            rnd.choice(SYLLABLES) for _ in range(rnd.randint(1, 3))
+        ))
+    words = sorted(words)
+    rnd.shuffle(words)
+    return words
+
+
+def fill(titles, rnd):
+    from django.db import transaction
+
+    from reviews.models import Title, TitleTrigram
+
+    words = make_words(rnd, 100000)
+    weights = list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    batch_size = 5000
+    for start in range(0, titles, batch_size):
+        batch = [
+            Title(
+                name=' '.join(rnd.choices(
+                    words, cum_weights=weights, k=rnd.randint(1, 4)
+                )).capitalize(),
+                year=rnd.randint(1950, 2023)
+            )
+            for _ in range(min(batch_size, titles - start))
+        ]
+        with transaction.atomic():
+            TitleTrigram.objects.create_for(
+                Title.objects.bulk_create_with_pks(batch)
+            )
+        print(f'\rЗаполнено {start + len(batch)}', end='', flush=True)
+    print()
+
+
+def add_typo(rnd, name):
+    position = rnd.randrange(1, len(name) - 1)
+    return name[:position] + name[position + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=1000000)
+    parser.add_argument('--database')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    setup_django(
+        args.database or os.path.join(directory.name, 'db.sqlite3')
+    )
+    from django.test import Client
+
+    from reviews.models import Title
+
+    rnd = random.Random(1)
+    if not Title.objects.exists():
+        fill(args.titles, rnd)
+    names = [
+        name for name in Title.objects.filter(
+            pk__in=[rnd.randint(1, args.titles) for _ in range(40)]
+        ).values_list('name', flat=True)
+        if len(name) > 8
+    ][:4]
+    common = Title.objects.filter(name__regex=r'^\w+$').values_list(
+        'name', flat=True
+    ).first()
+    queries = [add_typo(rnd, name) for name in names] + [
+        common.lower(), 'ба', 'с'
+    ]
+    client = Client()
+    rows = []
+    for query in queries:
+        def request():
+            response = client.get('/api/v1/titles/', {'fuzzy': query})
+            assert response.status_code == 200, response.content
+            return response
+
+        found = request().json()['count']
+        rows.append((query, f'{measure(request, args.repeat):.1f}', found))
+    print(f'{Title.objects.count()} произведений, медиана, мс')
+    print_table(('запрос', 'время', 'найдено'), rows)
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
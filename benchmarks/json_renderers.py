@@ -0,0 +1,64 @@
+"""Скорость JSON-рендерера и парсера DRF и orjson на больших страницах.
+
+    python benchmarks/json_renderers.py --titles 5000
+"""
+import argparse
+import io
+
+from utils import create_catalog, measure, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONParser, FastJSONRenderer
+    from api.serializers import ReviewSerializer, TitleReadSerializer
+    from reviews.models import Review, Title
+
+    create_catalog(args.titles, reviews_per_title=2)
+    pages = {
+        'произведения': TitleReadSerializer(
+            Title.objects.prefetch_related('titlegenre_set'), many=True
+        ).data,
+        'отзывы': ReviewSerializer(
+            Review.objects.select_related('author'), many=True
+        ).data,
+    }
+    rows = []
+    for name, data in pages.items():
+        content = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == content
+        size = len(content) / 2 ** 20
+        timings = []
+        for renderer, json_parser in ((JSONRenderer(), JSONParser()),
+                                      (FastJSONRenderer(), FastJSONParser())):
+            timings.append((
+                measure(lambda: renderer.render(data), args.repeat),
+                measure(lambda: json_parser.parse(io.BytesIO(content)),
+                        args.repeat),
+            ))
+        (drf_render, drf_parse), (fast_render, fast_parse) = timings
+        rows.append((
+            f'{name} ({len(data)})', f'{size:.1f}',
+            f'{size / drf_render * 1000:.0f}',
+            f'{size / fast_render * 1000:.0f}',
+            f'{size / drf_parse * 1000:.0f}',
+            f'{size / fast_parse * 1000:.0f}',
+        ))
+    print(f'Медиана по {args.repeat} вызовам, МБ/с')
+    print_table(
+        ('страница', 'МБ', 'DRF рендер', 'orjson рендер', 'DRF разбор',
+         'orjson разбор'),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Скорость загрузки CSV командой `load_csv`.
+
+    python benchmarks/load_csv.py --reviews 1000000
+
+Файлы генерируются во временной папке в формате static/data.
+"""
+import argparse
+import csv
+import random
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from utils import print_table, setup_django
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def generate(directory, reviews, seed=1):
+    rnd = random.Random(seed)
+    users = 1000
+    titles = max(reviews // users, 1)
+    write_csv(
+        directory / 'users.csv',
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+        ((idx, f'user{idx}', f'user{idx}@yamdb.fake', 'user', '', '', '')
+         for idx in range(1, users + 1))
+    )
+    write_csv(directory / 'category.csv', ('id', 'name', 'slug'),
+              ((1, 'Фильм', 'movie'), (2, 'Книга', 'book')))
+    write_csv(directory / 'genre.csv', ('id', 'name', 'slug'),
+              ((idx, f'Жанр {idx}', f'genre-{idx}') for idx in range(1, 16)))
+    write_csv(
+        directory / 'titles.csv', ('id', 'name', 'year', 'category'),
+        ((idx, f'Произведение {idx}', rnd.randint(1950, 2023),
+          rnd.randint(1, 2)) for idx in range(1, titles + 1))
+    )
+    write_csv(
+        directory / 'genre_title.csv', ('id', 'title_id', 'genre_id'),
+        ((idx, idx, rnd.randint(1, 15)) for idx in range(1, titles + 1))
+    )
+    # Каждый пользователь пишет не больше одного отзыва на произведение.
+    write_csv(
+        directory / 'review.csv',
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ((idx, (idx - 1) // users + 1, 'Текст отзыва ' * 10,
+          (idx - 1) % users + 1, rnd.randint(1, 10),
+          '2020-01-13T23:20:02.422Z')
+         for idx in range(1, titles * users + 1))
+    )
+    write_csv(
+        directory / 'comments.csv',
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ((idx, idx, 'Текст комментария', 1, '2020-01-13T23:20:02.422Z')
+         for idx in range(1, min(reviews, titles * users) // 10 + 1))
+    )
+    return titles * users
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reviews', type=int, default=200000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+
+    from reviews.models import Review
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        reviews = generate(directory, args.reviews)
+        for options in ((), ('--drop-indexes',)):
+            started = time.perf_counter()
+            call_command(
+                'load_csv', '--clear', '--path', str(directory),
+                '--batch-size', str(args.batch_size), *options,
+                stdout=StringIO()
+            )
+            elapsed = time.perf_counter() - started
+            assert Review.objects.count() == reviews
+            rows.append((
+                ' '.join(options) or '-', reviews, f'{elapsed:.1f}',
+                f'{reviews / elapsed:.0f}'
+            ))
+    print_table(('Параметры', 'Отзывов', 'Время, с', 'Отзывов/с'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Накладные расходы middleware на запрос к API.
+
+    python benchmarks/middleware.py --repeat 2000
+
+Сравниваются полный набор middleware и облегчённый для `/api/v1/`
+(`LEAN_MIDDLEWARE_PATHS`). Ответы на анонимные запросы берутся из кэша,
+поэтому время запроса почти целиком состоит из обработки middleware.
+"""
+import argparse
+
+from utils import create_catalog, measure, print_table, setup_django
+
+URLS = (
+    ('/api/v1/categories/', False),
+    ('/api/v1/titles/?year=2000', False),
+    ('/api/v1/users/me/', True),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django(ALLOWED_HOSTS=['*'])
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    create_catalog(100, reviews_per_title=1)
+    token = AccessToken.for_user(get_user_model().objects.first())
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+    lean_paths = settings.LEAN_MIDDLEWARE_PATHS
+    rows = []
+    for url, authorized in URLS:
+        timings = []
+        for paths in ((), lean_paths):
+            settings.LEAN_MIDDLEWARE_PATHS = paths
+            # Middleware читают настройку при создании цепочки клиента.
+            client = Client()
+            headers = auth if authorized else {}
+
+            def request():
+                response = client.get(url, **headers)
+                assert response.status_code == 200, response.content
+                return response
+
+            timings.append(measure(request, args.repeat) * 1000)
+        full, lean = timings
+        rows.append((
+            url, f'{full:.0f}', f'{lean:.0f}', f'{full - lean:.0f}',
+            f'{(full - lean) / full:.0%}'
+        ))
+    print(f'Медиана по {args.repeat} запросам, мкс')
+    print_table(
+        ('запрос', 'полный набор', 'облегчённый', 'экономия', 'доля'), rows
+    )
+
+
+if __name__ == '__main__':
+    main()
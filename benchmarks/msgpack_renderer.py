@@ -0,0 +1,60 @@
+"""Размер и время кодирования ответов в MessagePack против JSON.
+
+    python benchmarks/msgpack_renderer.py --titles 5000
+"""
+import argparse
+import io
+
+from utils import create_catalog, measure, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import (FastJSONParser, FastJSONRenderer,
+                               MessagePackParser, MessagePackRenderer)
+    from api.serializers import ReviewSerializer, TitleReadSerializer
+    from reviews.models import Review, Title
+
+    create_catalog(args.titles, reviews_per_title=2)
+    pages = {
+        'произведения': TitleReadSerializer(
+            Title.objects.prefetch_related('titlegenre_set'), many=True
+        ).data,
+        'отзывы': ReviewSerializer(
+            Review.objects.select_related('author'), many=True
+        ).data,
+    }
+    formats = (
+        ('JSON', JSONRenderer(), JSONParser()),
+        ('JSON (orjson)', FastJSONRenderer(), FastJSONParser()),
+        ('MessagePack', MessagePackRenderer(), MessagePackParser()),
+    )
+    rows = []
+    for name, data in pages.items():
+        for format_name, renderer, format_parser in formats:
+            content = renderer.render(data)
+            rows.append((
+                f'{name} ({len(data)})', format_name,
+                f'{len(content) / 2 ** 20:.2f}',
+                f'{measure(lambda: renderer.render(data), args.repeat):.1f}',
+                '{:.1f}'.format(measure(
+                    lambda: format_parser.parse(io.BytesIO(content)),
+                    args.repeat
+                )),
+            ))
+    print(f'Медиана по {args.repeat} вызовам')
+    print_table(
+        ('страница', 'формат', 'МБ', 'кодирование, мс', 'разбор, мс'), rows
+    )
+
+
+if __name__ == '__main__':
+    main()
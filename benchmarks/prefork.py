@@ -0,0 +1,143 @@
+"""Первый запрос к воркеру и память воркеров команды `serve`.
+
+    python benchmarks/prefork.py --titles 5000 --workers 4 --runs 3
+
+Сервер запускается в отдельном процессе с прогревом и без него
+(`--no-warm-up`). Для каждого запуска замеряется время первого запроса к
+списку произведений, затем сервер получает `--requests` запросов, и из
+отчёта команды берутся PSS и собственная (не общая с главным процессом)
+память воркеров. Нужен gunicorn (`pip install gunicorn`).
+"""
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean, median
+from urllib.request import urlopen
+
+from utils import PROJECT_DIR, print_table
+
+CODE = '''
+import sys
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+
+sys.path.insert(0, {benchmarks!r})
+settings.DATABASES['default']['NAME'] = sys.argv[1]
+django.setup()
+call_command('migrate', verbosity=0)
+from reviews.models import Title
+if not Title.objects.exists():
+    from utils import create_catalog
+    create_catalog(int(sys.argv[3]), reviews_per_title=1)
+if sys.argv[4] == 'cold':
+    print('ready', flush=True)
+    sys.exit()
+call_command(
+    'serve', bind=sys.argv[2], workers=int(sys.argv[5]), stats_interval=1,
+    warm_up=sys.argv[4] == 'warm'
+)
+'''.format(benchmarks=str(Path(__file__).resolve().parent))
+URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?genre=genre-1&ordering=-rating',
+    '/api/v1/categories/',
+)
+MEMORY = re.compile(r'^воркер \d+: .*PSS ([\d.]+) МБ, .*собственная ([\d.]+)')
+
+
+def run_server(database, bind, mode, args):
+    env = {
+        **os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+        'SECRET_KEY': 'benchmark',
+    }
+    return subprocess.Popen(
+        [sys.executable, '-c', CODE, database, bind, str(args.titles), mode,
+         str(args.workers)],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, text=True
+    )
+
+
+def wait_listening(process):
+    for line in process.stdout:
+        if line.startswith('Слушаю'):
+            return
+    raise RuntimeError('Сервер не запустился')
+
+
+def get(url):
+    start = time.perf_counter()
+    with urlopen(url) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_server(database, mode, args):
+    bind = '127.0.0.1:18765'
+    process = run_server(database, bind, mode, args)
+    try:
+        wait_listening(process)
+        first = get(f'http://{bind}{URLS[0]}')
+        for index in range(args.requests):
+            get(f'http://{bind}{URLS[index % len(URLS)]}')
+        # Ждём отчёт о памяти после нагрузки.
+        time.sleep(1.5)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        output, _ = process.communicate()
+    report = [
+        MEMORY.match(line) for line in output.splitlines()
+        if MEMORY.match(line)
+    ][-args.workers:]
+    return (
+        first,
+        mean(float(match[1]) for match in report),
+        mean(float(match[2]) for match in report),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'db.sqlite3')
+        run_server(database, '', 'cold', args).communicate()
+        rows = []
+        for mode, title in (('plain', 'без прогрева'),
+                            ('warm', 'с прогревом')):
+            results = [
+                measure_server(database, mode, args)
+                for _ in range(args.runs)
+            ]
+            first, pss, private = (
+                median(values) for values in zip(*results)
+            )
+            rows.append((
+                title, f'{first:.1f}', f'{pss:.1f}', f'{private:.1f}'
+            ))
+    print(
+        f'{args.workers} воркеров, {args.requests} запросов, '
+        f'медиана по {args.runs} запускам'
+    )
+    print_table(
+        ('режим', 'первый запрос, мс', 'PSS воркера, МБ',
+         'собственная, МБ'),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Память и время чтения списков: экземпляры моделей против строк.
+
+    python benchmarks/rows.py --titles 20000 --page-size 100
+
+Память считается на одну загруженную запись (tracemalloc), время - для
+сериализации страницы и для запроса к списку произведений целиком.
+"""
+import argparse
+import tracemalloc
+
+from utils import create_catalog, measure, print_table, setup_django
+
+
+def bytes_per_row(load):
+    tracemalloc.start()
+    rows = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django(ROW_READS=False, ALLOWED_HOSTS=['*'])
+    from django.conf import settings
+    from django.test import Client
+
+    from api.pagination import PubDatePagination, TitlePagination
+    from api.rows import get_row_plan
+    from api.serializers import ReviewSerializer, TitleReadSerializer
+    from reviews.models import Review, Title
+
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    TitlePagination.page_size = args.page_size
+    PubDatePagination.page_size = args.page_size
+    create_catalog(args.titles, reviews_per_title=2)
+    cases = (
+        ('произведения', TitleReadSerializer,
+         Title.objects.prefetch_related('titlegenre_set').order_by('pk'),
+         '/api/v1/titles/'),
+        ('отзывы', ReviewSerializer,
+         Review.objects.select_related('author').order_by('pk'),
+         None),
+    )
+    client = Client()
+    memory_rows = []
+    time_rows = []
+    for name, serializer_class, queryset, url in cases:
+        plan = get_row_plan(serializer_class())
+        memory_rows.append((
+            name,
+            f'{bytes_per_row(lambda: list(queryset.all())):.0f}',
+            '{:.0f}'.format(bytes_per_row(
+                lambda: list(queryset.prefetch_related(None).values_list(
+                    *plan.columns, named=True
+                ))
+            )),
+            '{:.0f}'.format(bytes_per_row(
+                lambda: plan.load_related(plan.values(queryset))
+            )),
+        ))
+
+        page = queryset.all()[:args.page_size]
+        instances = measure(
+            lambda: serializer_class(list(page.all()), many=True).data,
+            args.repeat
+        )
+        rows = measure(
+            lambda: serializer_class(
+                plan.load_related(plan.values(page)), many=True
+            ).data,
+            args.repeat
+        )
+        time_rows.append((
+            f'{name}, страница', f'{instances:.2f}', f'{rows:.2f}',
+            f'{instances / rows:.1f}x'
+        ))
+        if url is None:
+            continue
+
+        def request():
+            response = client.get(url)
+            assert response.status_code == 200, response.content
+            return response
+
+        settings.ROW_READS = False
+        api_instances = measure(request, args.repeat)
+        settings.ROW_READS = True
+        api_rows = measure(request, args.repeat)
+        time_rows.append((
+            f'{name}, {url}', f'{api_instances:.2f}', f'{api_rows:.2f}',
+            f'{api_instances / api_rows:.1f}x'
+        ))
+    print(f'Произведений: {args.titles}; байт на запись')
+    print_table(('список', 'модели', 'namedtuple без связей', 'строки'),
+                memory_rows)
+    print(f'\nСтраница {args.page_size}, медиана по {args.repeat} запросам')
+    print_table(('замер', 'модели, мс', 'строки, мс', 'ускорение'),
+                time_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Сравнение сериализации списков через DRF и скомпилированных функций.
+
+    python benchmarks/serializers.py --titles 20000 --page-size 100
+"""
+import argparse
+
+from utils import create_catalog, measure, print_table, setup_django
+
+URLS = (
+    ('/api/v1/titles/', {}),
+    ('/api/v1/titles/', {'cursor': '', 'ordering': '-rating'}),
+    ('/api/v1/titles/', {'fields': 'id,name,genre'}),
+    ('/api/v1/titles/1/reviews/', {}),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django(FAST_SERIALIZERS=False, ALLOWED_HOSTS=['*'])
+    from django.conf import settings
+    from django.test import Client
+
+    from api.pagination import (PubDateKeysetPagination, PubDatePagination,
+                                TitleKeysetPagination, TitlePagination)
+
+    settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+    for pagination in (TitlePagination, PubDatePagination,
+                       TitleKeysetPagination, PubDateKeysetPagination):
+        pagination.page_size = args.page_size
+    create_catalog(args.titles, reviews_per_title=args.page_size)
+    client = Client()
+    rows = []
+    for url, params in URLS:
+        responses = {}
+
+        def request():
+            response = client.get(url, params)
+            assert response.status_code == 200, response.content
+            return response
+
+        settings.FAST_SERIALIZERS = False
+        drf = measure(request, args.repeat)
+        responses[False] = request().content
+        settings.FAST_SERIALIZERS = True
+        fast = measure(request, args.repeat)
+        responses[True] = request().content
+        assert responses[False] == responses[True], url
+        rows.append((
+            f'{url} {params}', f'{drf:.2f}', f'{fast:.2f}',
+            f'{drf / fast:.1f}x'
+        ))
+    print(f'Произведений: {args.titles}, медиана по {args.repeat} запросам')
+    print_table(('запрос', 'DRF, мс', 'быстрый, мс', 'ускорение'), rows)
+
+
+if __name__ == '__main__':
+    main()
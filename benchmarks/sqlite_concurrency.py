@@ -0,0 +1,162 @@
+"""Параллельные чтение и запись в SQLite с настройками соединения и без.
+
+    python benchmarks/sqlite_concurrency.py --readers 4 --writers 4
+
+Процессы-читатели запрашивают списки произведений, процессы-писатели
+создают отзывы через API. Сравниваются стандартное соединение
+(журнал DELETE, новое соединение на каждый запрос) и настройки проекта:
+`SQLITE_PRAGMAS` (WAL, busy_timeout, mmap) и `CONN_MAX_AGE`. Выводятся
+запросы в секунду и число ошибок ("database is locked").
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from utils import PROJECT_DIR, create_catalog, print_table
+
+READ_URLS = (
+    '/api/v1/titles/?year={}',
+    '/api/v1/titles/{}/reviews/',
+)
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DEBUG = False
+    settings.API_CACHE['ENABLED'] = False
+
+
+def prepare(path, tuned, args):
+    """Создаёт БД в файле `path` и возвращает id произведений и токены."""
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.models import Title
+
+    connection.close()
+    connection.settings_dict['NAME'] = path
+    connection.settings_dict['CONN_MAX_AGE'] = 60 if tuned else 0
+    if not tuned:
+        settings.SQLITE_PRAGMAS = {}
+    call_command('migrate', verbosity=0)
+    create_catalog(args.titles, reviews_per_title=0)
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'writer{idx}', email=f'writer{idx}@yamdb.fake')
+        for idx in range(args.writers)
+    )
+    users = User.objects.filter(username__startswith='writer')
+    tokens = [str(AccessToken.for_user(user)) for user in users]
+    title_ids = list(Title.objects.values_list('pk', flat=True))
+    connection.close()
+    return title_ids, tokens
+
+
+def read(title_ids, deadline, results):
+    from django.test import Client
+
+    client = Client(raise_request_exception=False)
+    done = errors = 0
+    while time.monotonic() < deadline:
+        url = READ_URLS[done % 2].format(
+            1950 + done % 70 if done % 2 == 0
+            else title_ids[done % len(title_ids)]
+        )
+        if client.get(url).status_code == 200:
+            done += 1
+        else:
+            errors += 1
+    results.put(('read', done, errors))
+
+
+def write(title_ids, token, deadline, results):
+    from django.test import Client
+
+    client = Client(
+        raise_request_exception=False, HTTP_AUTHORIZATION=f'Bearer {token}'
+    )
+    done = errors = 0
+    for title_id in title_ids:
+        if time.monotonic() >= deadline:
+            break
+        response = client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            {'text': 'Отзыв', 'score': 7}, content_type='application/json'
+        )
+        if response.status_code == 201:
+            done += 1
+        else:
+            errors += 1
+    results.put(('write', done, errors))
+
+
+def run(title_ids, tokens, args):
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    deadline = time.monotonic() + args.duration
+    processes = [
+        context.Process(target=read, args=(title_ids, deadline, results))
+        for _ in range(args.readers)
+    ] + [
+        context.Process(
+            target=write, args=(title_ids, token, deadline, results)
+        )
+        for token in tokens
+    ]
+    for process in processes:
+        process.start()
+    totals = {'read': [0, 0], 'write': [0, 0]}
+    for _ in processes:
+        kind, done, errors = results.get()
+        totals[kind][0] += done
+        totals[kind][1] += errors
+    for process in processes:
+        process.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for tuned, title in ((False, 'стандартное'),
+                             (True, 'WAL и CONN_MAX_AGE')):
+            path = os.path.join(directory, f'{tuned}.sqlite3')
+            title_ids, tokens = prepare(path, tuned, args)
+            totals = run(title_ids, tokens, args)
+            rows.append((
+                title,
+                f'{totals["read"][0] / args.duration:.0f}',
+                f'{totals["write"][0] / args.duration:.0f}',
+                totals['read'][1] + totals['write'][1],
+            ))
+    print(
+        f'{args.readers} читателей, {args.writers} писателей, '
+        f'{args.duration:g} с'
+    )
+    print_table(
+        ('соединение', 'чтений/с', 'записей/с', 'ошибок'), rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Время запуска процесса с полным профилем настроек и с API_ONLY.
+
+    python benchmarks/startup.py --runs 5
+
+Каждый запуск - отдельный процесс `python -X importtime`, который
+создаёт WSGI-приложение и загружает URL API. Выводятся медианы общего
+времени запуска и импорта, а также разбивка времени импорта по пакетам
+верхнего уровня, как в `-X importtime`.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from statistics import median
+
+from utils import PROJECT_DIR, print_table
+
+CODE = '''
+from django.core.wsgi import get_wsgi_application
+from django.urls import resolve
+
+get_wsgi_application()
+resolve('/api/v1/titles/')
+'''
+PROFILES = (
+    ('полный', {'API_ONLY': 'false'}),
+    ('API_ONLY', {'API_ONLY': 'true'}),
+    # Django 3.2 импортирует distutils, а подмена distutils из setuptools
+    # тянет pkg_resources. Переменная читается только при старте Python.
+    ('API_ONLY, stdlib distutils',
+     {'API_ONLY': 'true', 'SETUPTOOLS_USE_DISTUTILS': 'stdlib'}),
+)
+
+
+def parse_importtime(output):
+    """Суммарное время импорта и собственное время по пакетам, мкс."""
+    total = 0
+    packages = Counter()
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+        packages[name.strip().split('.')[0]] += int(self_time)
+    return total, packages
+
+
+def run(env):
+    env = {
+        **os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'), **env,
+    }
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CODE], cwd=PROJECT_DIR,
+        env=env, capture_output=True, text=True, check=True
+    )
+    return time.perf_counter() - started, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12)
+    args = parser.parse_args()
+
+    summary = []
+    packages = {}
+    for name, env in PROFILES:
+        runs = [run(env) for _ in range(args.runs)]
+        wall = median(elapsed for elapsed, _ in runs)
+        imports = median(total for _, (total, _) in runs)
+        summary.append((name, f'{wall * 1000:.0f}', f'{imports / 1000:.0f}'))
+        packages[name] = Counter()
+        for _, (_, counter) in runs:
+            packages[name].update(counter)
+    print(f'Медиана по {args.runs} запускам')
+    print_table(('профиль', 'запуск, мс', 'импорт, мс'), summary)
+
+    full = packages[PROFILES[0][0]]
+    rows = []
+    for package, self_time in full.most_common(args.top):
+        rows.append((package, *(
+            f'{packages[name][package] / args.runs / 1000:.1f}'
+            for name, _ in PROFILES
+        )))
+    print('\nСобственное время импорта пакетов, мс (среднее)')
+    print_table(('пакет', *(name for name, _ in PROFILES)), rows)
+
+
+if __name__ == '__main__':
+    main()
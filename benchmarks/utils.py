@@ -0,0 +1,130 @@
+"""Общие функции для скриптов замера производительности.
+
+Скрипты запускаются из корня репозитория, например:
+
+    python benchmarks/catalog_engine.py --titles 100000
+
+и работают с временной тестовой базой, не затрагивая db.sqlite3.
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django(**settings):
+    """Настраивает Django и создаёт пустую тестовую БД с миграциями."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    import django
+    from django.conf import settings as django_settings
+
+    django.setup()
+    for name, value in settings.items():
+        setattr(django_settings, name, value)
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def create_catalog(titles, reviews_per_title=3, seed=1):
+    """Заполняет БД произведениями, жанрами, отзывами и комментариями."""
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+
+    from reviews.models import (Category, Comment, Genre, Review, Title,
+                                TitleGenre)
+
+    rnd = random.Random(seed)
+    User = get_user_model()
+    with transaction.atomic():
+        Category.objects.bulk_create(
+            Category(name=name, slug=slug)
+            for name, slug in (('Фильм', 'movie'), ('Книга', 'book'),
+                               ('Музыка', 'music'))
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(15)
+        )
+        User.objects.bulk_create(
+            User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            for idx in range(reviews_per_title)
+        )
+        categories = list(Category.objects.values_list('pk', flat=True))
+        genres = list(Genre.objects.values_list('pk', flat=True))
+        users = list(User.objects.values_list('pk', flat=True))
+        Title.objects.bulk_create(
+            (
+                Title(
+                    name=f'Произведение {idx} {rnd.choice("абвгдеж")}',
+                    year=rnd.randint(1950, 2023),
+                    category_id=rnd.choice(categories),
+                    description='Описание произведения ' * 5
+                )
+                for idx in range(titles)
+            ),
+            batch_size=2000
+        )
+        title_ids = list(Title.objects.values_list('pk', flat=True))
+        TitleGenre.objects.bulk_create(
+            (
+                TitleGenre(title_id=title_id, genre_id=genre_id)
+                for title_id in title_ids
+                for genre_id in rnd.sample(genres, 2)
+            ),
+            batch_size=2000
+        )
+        Review.objects.bulk_create(
+            (
+                Review(title_id=title_id, author_id=author_id,
+                       text='Текст отзыва ' * 10, score=rnd.randint(1, 10))
+                for title_id in title_ids
+                for author_id in users
+            ),
+            batch_size=2000
+        )
+        first_reviews = Review.objects.order_by('pk').values_list(
+            'pk', flat=True
+        )[:100]
+        Comment.objects.bulk_create(
+            (
+                Comment(review_id=review_id, author_id=users[0],
+                        text='Текст комментария ' * 5)
+                for review_id in first_reviews
+                for _ in range(10)
+            ),
+            batch_size=2000
+        )
+        Title.objects.all().update_rating()
+
+
+def measure(function, repeat=20):
+    """Возвращает медианное время вызова функции в миллисекундах."""
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def print_table(header, rows):
+    widths = [
+        max(len(str(row[column])) for row in [header, *rows])
+        for column in range(len(header))
+    ]
+    for row in [header, *rows]:
+        print('  '.join(
+            str(value).ljust(width) for value, width in zip(row, widths)
+        ))
@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import caches
+
+from api.lookups import category_lookup, genre_lookup
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """База очищается между тестами, поэтому и кэш ответов тоже."""
+    for cache in caches.all():
+        cache.clear()
+    category_lookup.clear()
+    genre_lookup.clear()
+    yield
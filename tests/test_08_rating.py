@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_rating_follows_reviews(self, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            10, 2, 5
+        ), (
+            'Проверьте, что при создании отзыва обновляется хранимый '
+            'рейтинг произведения.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            data={'score': 8}
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            13, 2, 6.5
+        ), (
+            'Проверьте, что при изменении отзыва обновляется хранимый '
+            'рейтинг произведения.'
+        )
+
+        Review.objects.filter(pk=reviews[0]['id']).delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            5, 1, 5
+        ), (
+            'Проверьте, что при удалении отзыва обновляется хранимый '
+            'рейтинг произведения.'
+        )
+
+        Review.objects.all().delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            0, 0, None
+        ), (
+            'Проверьте, что у произведения без отзывов нет рейтинга.'
+        )
+
+    def test_02_update_ratings_command(self, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('update_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            10, 2, 5
+        ), (
+            'Проверьте, что команда `update_ratings` пересчитывает рейтинг '
+            'произведений.'
+        )
+
+    def test_03_title_save_keeps_rating(self, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        Review.objects.create(title=title, author=admin, text='+', score=9)
+
+        title.description = 'I`ll be back'
+        title.save()
+
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (9, 1), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг, пересчитанный по отзывам.'
+        )
@@ -0,0 +1,67 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from api.lookups import category_lookup, genre_lookup
+from api.serializers import TitleReadSerializer
+from api.views import TitlesViewSet
+from reviews.models import Category, Genre, Title, TitleGenre
+
+
+def create_catalog(size):
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(3)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(5)
+    )
+    categories = list(Category.objects.order_by('pk'))
+    genres = list(Genre.objects.order_by('pk'))
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000,
+              category=categories[idx % len(categories)])
+        for idx in range(size)
+    )
+    titles = Title.objects.order_by('pk')
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genre)
+        for idx, title in enumerate(titles)
+        for genre in genres[:idx % 3 + 1]
+    )
+    category_lookup.ensure_fresh()
+    genre_lookup.ensure_fresh()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('size', (10, 100, 1000))
+    def test_01_serialize_titles(self, size, django_assert_num_queries):
+        create_catalog(size)
+        request = APIRequestFactory().get(self.TITLES_URL)
+        queryset = TitlesViewSet.queryset.all()
+
+        with django_assert_num_queries(2):
+            data = TitleReadSerializer(
+                queryset, many=True, context={'request': request}
+            ).data
+
+        assert len(data) == size
+        assert all(title['category'] for title in data), (
+            'Проверьте, что для каждого произведения возвращается категория.'
+        )
+        assert all(title['genre'] for title in data), (
+            'Проверьте, что для каждого произведения возвращаются жанры.'
+        )
+
+    def test_02_titles_list(self, client, django_assert_num_queries,
+                            settings):
+        settings.API_CACHE = {**settings.API_CACHE, 'ENABLED': False}
+        create_catalog(100)
+
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+
+        assert len(response.json()['results']) == 10
@@ -0,0 +1,116 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleCursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        Category.objects.bulk_create([
+            Category(name='Фильм', slug='films'),
+            Category(name='Книги', slug='books'),
+        ])
+        films, books = Category.objects.order_by('slug').reverse()
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {idx}',
+                year=1990 + idx % 4,
+                category=films if idx % 2 else books,
+                rating=None if idx % 5 == 0 else idx % 3 + 5,
+            )
+            for idx in range(27)
+        )
+        return Title.objects.all()
+
+    def walk(self, client, url):
+        names = []
+        pages = []
+        while url:
+            data = client.get(url).json()
+            assert set(data) == {'next', 'previous', 'results'}, (
+                'Проверьте, что в курсорном режиме ответ содержит ключи '
+                '`next`, `previous` и `results`.'
+            )
+            pages.append(data)
+            names.extend(title['name'] for title in data['results'])
+            url = data['next']
+        return names, pages
+
+    @pytest.mark.parametrize('ordering', (
+        'id', '-id', 'year', '-year', 'rating', '-rating'
+    ))
+    def test_01_cursor_walk(self, client, titles, ordering):
+        names, pages = self.walk(
+            client, f'{self.TITLES_URL}?cursor=&ordering={ordering}'
+        )
+        field = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+        expected = sorted(
+            titles,
+            key=lambda title: (
+                getattr(title, field) is not None,
+                getattr(title, field) or 0,
+                title.id
+            ),
+            reverse=descending
+        )
+        assert names == [title.name for title in expected], (
+            'Проверьте, что курсорная пагинация возвращает все произведения '
+            'в порядке сортировки без пропусков и повторов.'
+        )
+        assert len(pages) == 3
+        assert pages[0]['previous'] is None
+
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу.'
+        )
+
+    def test_02_cursor_with_filter(self, client, titles):
+        names, _ = self.walk(
+            client, f'{self.TITLES_URL}?cursor=&ordering=-year&category=films'
+        )
+        expected = titles.filter(category__slug='films').order_by('-year',
+                                                                  '-id')
+        assert names == [title.name for title in expected], (
+            'Проверьте, что курсорная пагинация учитывает фильтры.'
+        )
+
+    def test_03_invalid_cursor(self, client, titles):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == 404
+
+    def test_04_page_number_by_default(self, client, titles):
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 27
+
+    @pytest.mark.parametrize('ordering', (
+        'id', '-id', 'year', '-year', 'rating', '-rating'
+    ))
+    def test_05_cursor_uses_index_range(self, client, titles, ordering,
+                                        django_assert_max_num_queries):
+        url = client.get(
+            f'{self.TITLES_URL}?cursor=&ordering={ordering}'
+        ).json()['next']
+        with django_assert_max_num_queries(10) as context:
+            client.get(url)
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+            and 'LIMIT' in query['sql']
+        ]
+        assert queries
+        for sql in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            assert 'SEARCH reviews_title' in plan, (
+                'Проверьте, что условие курсора выбирает страницу диапазоном '
+                f'индекса, а не просмотром таблицы: {plan}'
+            )
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ReviewCommentCursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def review(self, django_user_model):
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{idx}',
+                              email=f'user{idx}@yamdb.fake')
+            for idx in range(23)
+        )
+        title = Title.objects.create(name='Терминатор', year=1984)
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        for idx, author in enumerate(django_user_model.objects.all()):
+            review = Review.objects.create(
+                title=title, author=author, text=f'review {idx}', score=5
+            )
+            Comment.objects.create(
+                review=Review.objects.first(), author=author,
+                text=f'comment {idx}'
+            )
+            # Несколько записей с одинаковой датой проверяют обход по id.
+            pub_date = start - timedelta(minutes=idx // 3)
+            Review.objects.filter(pk=review.pk).update(pub_date=pub_date)
+        Comment.objects.update(pub_date=start)
+        return Review.objects.order_by('pk').first()
+
+    def walk(self, client, url):
+        texts = []
+        pages = []
+        while url:
+            data = client.get(url).json()
+            pages.append(data)
+            texts.extend(obj['text'] for obj in data['results'])
+            url = data['next']
+        return texts, pages
+
+    @pytest.mark.parametrize('ordering', ('pub_date', '-pub_date'))
+    def test_01_reviews_cursor(self, client, review, ordering):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        texts, pages = self.walk(client, f'{url}?cursor=&ordering={ordering}')
+        expected = Review.objects.order_by(ordering, ordering.replace(
+            'pub_date', 'id'
+        ))
+        assert texts == [obj.text for obj in expected], (
+            f'Проверьте, что курсорная пагинация `{self.REVIEWS_URL_TEMPLATE}`'
+            ' возвращает все отзывы без пропусков и повторов.'
+        )
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results']
+
+    def test_02_comments_cursor(self, client, review):
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        texts, pages = self.walk(client, f'{url}?cursor=')
+        expected = review.comments.order_by('pub_date', 'id')
+        assert texts == [obj.text for obj in expected], (
+            f'Проверьте, что курсорная пагинация `{self.COMMENTS_URL_TEMPLATE}`'
+            ' возвращает все комментарии без пропусков и повторов.'
+        )
+        assert len(pages) == 3
+
+    def test_03_page_number_ordered(self, client, review):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id)
+        data = client.get(f'{url}?page=2').json()
+        expected = Review.objects.order_by('pub_date', 'id')[10:20]
+        assert [obj['id'] for obj in data['results']] == [
+            obj.id for obj in expected
+        ], 'Проверьте, что отзывы отсортированы по дате публикации.'
+
+    @pytest.mark.parametrize('ordering', ('pub_date', '-pub_date'))
+    def test_04_cursor_uses_index_range(self, client, review, ordering,
+                                        django_assert_max_num_queries):
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=review.title_id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=review.title_id, review_id=review.id
+            ),
+        )
+        for url, table, parent in zip(urls, ('reviews_review',
+                                             'reviews_comment'),
+                                      ('title_id', 'review_id')):
+            url = client.get(
+                f'{url}?cursor=&ordering={ordering}'
+            ).json()['next']
+            with django_assert_max_num_queries(10) as context:
+                client.get(url)
+            sql = next(
+                query['sql'] for query in context.captured_queries
+                if f'FROM "{table}"' in query['sql'] and 'LIMIT' in query['sql']
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            assert f'{parent}=? AND pub_date' in plan, (
+                'Проверьте, что страница выбирается диапазоном индекса '
+                f'({parent}, pub_date, id): {plan}'
+            )
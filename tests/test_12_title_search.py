@@ -0,0 +1,73 @@
+import pytest
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        return {
+            'shawshank': Title.objects.create(
+                name='Побег из Шоушенка', year=1994, category=films,
+                description='Тюремная драма о надежде'
+            ),
+            'escape': Title.objects.create(
+                name='Побег', year=2005, category=books,
+                description='Побег, погоня и снова побег'
+            ),
+            'godfather': Title.objects.create(
+                name='Крёстный отец', year=1972, category=films,
+                description='Семейная сага о мафии'
+            ),
+        }
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, client, titles):
+        assert self.search(client, 'мафии') == ['Крёстный отец'], (
+            'Проверьте, что параметр `search` ищет по описанию произведения.'
+        )
+        assert self.search(client, 'шоушенк') == ['Побег из Шоушенка'], (
+            'Проверьте, что параметр `search` ищет по началу слова.'
+        )
+        assert self.search(client, 'ПОБЕГ') == ['Побег', 'Побег из Шоушенка'], (
+            'Проверьте, что результаты поиска отсортированы по релевантности.'
+        )
+
+    def test_02_search_with_filters(self, client, titles):
+        response = client.get(
+            self.TITLES_URL, {'search': 'побег', 'category': 'films'}
+        )
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Побег из Шоушенка'], (
+            'Проверьте, что полнотекстовый поиск сочетается с фильтрами.'
+        )
+
+    def test_03_index_follows_writes(self, client, titles):
+        titles['godfather'].description = 'Сага о семье Корлеоне'
+        titles['godfather'].save()
+        titles['shawshank'].delete()
+
+        assert self.search(client, 'мафии') == []
+        assert self.search(client, 'корлеоне') == ['Крёстный отец']
+        assert self.search(client, 'шоушенк') == [], (
+            'Проверьте, что полнотекстовый индекс обновляется при изменении '
+            'и удалении произведений.'
+        )
+
+    def test_04_search_syntax_is_escaped(self, client, titles):
+        assert self.search(client, '(шоушенка*")') == [
+            'Побег из Шоушенка'
+        ], (
+            'Проверьте, что служебные символы FTS5 в запросе экранируются.'
+        )
+        assert len(self.search(client, '"*')) == len(titles)
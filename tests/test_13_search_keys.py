@@ -0,0 +1,58 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13SearchKeys:
+
+    def test_01_key_follows_name(self):
+        title = Title.objects.create(name='Побег из  ШОУШЕНКА', year=1994)
+        assert title.name_key == 'побег из шоушенка'
+        title.name = 'Ёлки'
+        title.save()
+        title.refresh_from_db()
+        assert title.name_key == 'ёлки', (
+            'Проверьте, что ключ поиска обновляется при сохранении.'
+        )
+
+    def test_02_titles_name_filter(self, client):
+        Title.objects.create(name='Побег из Шоушенка', year=1994)
+        Title.objects.create(name='Побег', year=2005)
+        Title.objects.create(name='Крёстный отец', year=1972)
+
+        response = client.get('/api/v1/titles/', {'name': 'ПОБЕГ ИЗ'})
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Побег из Шоушенка'], (
+            'Проверьте, что фильтр `name` не зависит от регистра кириллицы.'
+        )
+
+    @pytest.mark.parametrize('model, url', (
+        (Category, '/api/v1/categories/'),
+        (Genre, '/api/v1/genres/'),
+    ))
+    def test_03_category_genre_search(self, client, model, url):
+        model.objects.create(name='Научная фантастика', slug='sci-fi')
+        model.objects.create(name='Фэнтези', slug='fantasy')
+
+        response = client.get(url, {'search': 'НАУЧНАЯ ф'})
+        slugs = [obj['slug'] for obj in response.json()['results']]
+        assert slugs == ['sci-fi'], (
+            f'Проверьте, что поиск `{url}?search=` не зависит от регистра '
+            'кириллицы.'
+        )
+
+    def test_04_users_search(self, admin_client, django_user_model):
+        django_user_model.objects.create(
+            username='Иван', email='ivan@yamdb.fake'
+        )
+        response = admin_client.get('/api/v1/users/', {'search': 'иВАН'})
+        usernames = [user['username'] for user in response.json()['results']]
+        assert usernames == ['Иван']
+
+    def test_05_prefix_uses_index(self):
+        queryset = Title.objects.filter(name_key__prefix='Побег')
+        plan = queryset.explain()
+        assert 'reviews_title_name_key' in plan, (
+            'Проверьте, что поиск по префиксу использует индекс.'
+        )
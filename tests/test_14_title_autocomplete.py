@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+
+from api.autocomplete import title_autocomplete_index
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleAutocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/titles/autocomplete/'
+
+    @pytest.fixture(autouse=True)
+    def clear_index(self):
+        title_autocomplete_index.clear()
+        yield
+        title_autocomplete_index.clear()
+
+    def suggest(self, client, query, **params):
+        response = client.get(self.AUTOCOMPLETE_URL, {'q': query, **params})
+        assert response.status_code == 200, (
+            f'Эндпоинт `{self.AUTOCOMPLETE_URL}` не найден или недоступен.'
+        )
+        return [title['name'] for title in response.json()]
+
+    def test_01_prefix_of_any_word(self, client):
+        Title.objects.create(name='Побег из Шоушенка', year=1994)
+        Title.objects.create(name='Крёстный отец', year=1972)
+
+        assert self.suggest(client, 'шоу') == ['Побег из Шоушенка']
+        assert self.suggest(client, 'ПОБ') == ['Побег из Шоушенка']
+        assert self.suggest(client, 'отец') == ['Крёстный отец']
+        assert self.suggest(client, '') == []
+
+    def test_02_ordered_by_rating(self, client, user, admin):
+        low = Title.objects.create(name='Побег', year=2005)
+        high = Title.objects.create(name='Побег из Шоушенка', year=1994)
+        Title.objects.create(name='Побег из Алькатраса', year=1979)
+        self.suggest(client, 'по')
+
+        Review.objects.create(title=low, author=user, text='-', score=3)
+        Review.objects.create(title=high, author=admin, text='+', score=10)
+
+        assert self.suggest(client, 'побег', limit=2) == [
+            'Побег из Шоушенка', 'Побег'
+        ], (
+            'Проверьте, что подсказки отсортированы по рейтингу и индекс '
+            'обновляется при добавлении отзывов.'
+        )
+
+    def test_03_index_follows_writes(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        assert self.suggest(client, 'терм') == ['Терминатор']
+
+        title.name = 'Терминатор 2'
+        title.save()
+        Title.objects.create(name='Титаник', year=1997)
+        assert self.suggest(client, 'т') == ['Терминатор 2', 'Титаник']
+
+        title.delete()
+        assert self.suggest(client, 'терм') == [], (
+            'Проверьте, что индекс подсказок обновляется при изменении '
+            'произведений.'
+        )
+
+    def test_04_writes_from_other_process(self, client, monkeypatch):
+        monkeypatch.setattr(title_autocomplete_index, 'check_interval', 0)
+        title = Title.objects.create(name='Терминатор', year=1984)
+        assert self.suggest(client, 'терм') == ['Терминатор']
+
+        other = connection.copy()
+        try:
+            with other.cursor() as cursor:
+                cursor.execute(
+                    'UPDATE reviews_title SET name = %s, name_key = %s '
+                    'WHERE id = %s',
+                    ['Чужой', 'чужой', title.pk]
+                )
+                cursor.execute(
+                    'INSERT INTO reviews_tableversion ("table", version) '
+                    'VALUES (%s, 1) ON CONFLICT ("table") '
+                    'DO UPDATE SET version = version + 1',
+                    [Title._meta.label_lower]
+                )
+        finally:
+            other.close()
+        assert self.suggest(client, 'терм') == []
+        assert self.suggest(client, 'чуж') == ['Чужой'], (
+            'Проверьте, что индекс подсказок сверяет версию таблицы '
+            'произведений в БД и видит изменения из других процессов.'
+        )
+
+    def test_05_add_many(self):
+        first = Title.objects.create(name='Терминатор', year=1984)
+        title_autocomplete_index.ensure_loaded()
+        title_autocomplete_index.add_many([
+            (first.pk, 'Терминатор 2', None, 0),
+            (first.pk + 1, 'Титаник', 8, 1),
+            (first.pk + 2, 'Тень', None, 0),
+        ])
+        assert title_autocomplete_index.keys == sorted(
+            title_autocomplete_index.keys
+        )
+        assert [
+            name for _, name, _, _ in title_autocomplete_index.search('т')
+        ] == ['Титаник', 'Терминатор 2', 'Тень'], (
+            'Проверьте, что `add_many` заменяет и добавляет произведения.'
+        )
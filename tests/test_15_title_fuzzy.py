@@ -0,0 +1,99 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Category, Title, TitleTrigram
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFuzzySearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        films = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.create(name='Побег из Шоушенка', year=1994,
+                             category=films)
+        Title.objects.create(name='Крёстный отец', year=1972, category=films)
+        Title.objects.create(name='Шоу Трумана', year=1998)
+
+    def fuzzy(self, client, query, **params):
+        response = client.get(self.TITLES_URL, {'fuzzy': query, **params})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_typos(self, client, titles):
+        assert self.fuzzy(client, 'Шоушенк')[0] == 'Побег из Шоушенка', (
+            'Проверьте, что нечёткий поиск находит название с опечаткой.'
+        )
+        assert self.fuzzy(client, 'крестный атец') == ['Крёстный отец']
+        assert self.fuzzy(client, 'Титаник') == []
+
+    def test_02_with_filters(self, client, titles):
+        assert self.fuzzy(client, 'шоушенко', category='films') == [
+            'Побег из Шоушенка'
+        ]
+
+    def test_03_trigrams_follow_writes(self, client, titles):
+        title = Title.objects.get(name='Крёстный отец')
+        title.name = 'Крёстная мать'
+        title.save()
+        assert self.fuzzy(client, 'крестный атец') == []
+        assert self.fuzzy(client, 'крестная мат') == ['Крёстная мать']
+
+        TitleTrigram.objects.all().delete()
+        call_command('update_trigrams')
+        assert self.fuzzy(client, 'крестная мат') == ['Крёстная мать'], (
+            'Проверьте, что команда `update_trigrams` пересоздаёт индекс.'
+        )
+
+    def test_04_trigram_count(self, client, titles):
+        title = Title.objects.get(name='Шоу Трумана')
+        trigrams = TitleTrigram.objects.filter(title=title)
+        assert set(trigrams.values_list('trigram_count', flat=True)) == {
+            trigrams.count()
+        }, (
+            'Проверьте, что у триграмм хранится число триграмм названия.'
+        )
+        title.name = 'Шоу'
+        title.save()
+        assert set(trigrams.values_list('trigram_count', flat=True)) == {
+            trigrams.count()
+        }
+
+    def test_05_short_words(self, client, titles):
+        Title.objects.create(name='Ба', year=2000)
+        assert self.fuzzy(client, 'ба') == [], (
+            'Проверьте, что запрос только из слов короче трёх букв '
+            'не выполняется: их триграммы есть почти у всех названий.'
+        )
+        assert self.fuzzy(client, 'шоу') == ['Шоу Трумана']
+
+    def test_06_band_uses_index_range(self, titles):
+        captured = []
+        with connection.execute_wrapper(
+            lambda execute, sql, *args: captured.append(sql)
+            or execute(sql, *args)
+        ):
+            TitleTrigram.objects.similar('крестный атец', 0.3, 10)
+        for sql in captured:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'EXPLAIN QUERY PLAN {sql.replace("%s", "?")}',
+                    [None] * sql.count('%s')
+                )
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            assert 'trigram=? AND trigram_count>? AND trigram_count<?' in (
+                plan
+            ), (
+                'Проверьте, что полоса длин названий читается диапазоном '
+                f'индекса (trigram, trigram_count, title): {plan}'
+            )
+            if 'similarity' in sql:
+                assert 'trigram=? AND trigram_count=? AND title_id=?' in (
+                    plan
+                ), (
+                    'Проверьте, что частые триграммы досчитываются по '
+                    f'полному ключу индекса: {plan}'
+                )
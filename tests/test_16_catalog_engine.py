@@ -0,0 +1,142 @@
+import random
+
+import pytest
+from django.db import connection
+
+from api.catalog import catalog_engine
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+
+pytest.importorskip('numpy')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16CatalogEngine:
+
+    TITLES_URL = '/api/v1/titles/'
+    QUERIES = (
+        {},
+        {'page': 2},
+        {'category': 'films'},
+        {'category': 'unknown'},
+        {'genre': 'drama'},
+        {'genre': 'drama', 'category': 'books', 'year': 1991},
+        {'year': 1992},
+        {'name': 'ПРОИЗВЕДЕНИЕ 1'},
+        {'ordering': 'rating'},
+        {'ordering': '-rating', 'page': 3},
+        {'ordering': '-year', 'genre': 'comedy'},
+        {'ordering': '-id'},
+    )
+
+    @pytest.fixture(autouse=True)
+    def engine(self, settings):
+        settings.CATALOG_ENGINE = True
+        catalog_engine.clear()
+        yield catalog_engine
+        catalog_engine.clear()
+
+    @pytest.fixture
+    def catalog(self, django_user_model):
+        rnd = random.Random(1)
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        author = django_user_model.objects.create(
+            username='author', email='author@yamdb.fake'
+        )
+        for idx in range(45):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=1990 + idx % 4,
+                category=rnd.choice((films, books, None))
+            )
+            for genre in genres:
+                if rnd.random() < 0.5:
+                    TitleGenre.objects.create(title=title, genre=genre)
+            if idx % 3:
+                Review.objects.create(
+                    title=title, author=author, text='-',
+                    score=rnd.randint(1, 10)
+                )
+
+    def get(self, client, settings, enabled, params):
+        settings.CATALOG_ENGINE = enabled
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_01_same_results_as_orm(self, client, settings, catalog):
+        for params in self.QUERIES:
+            assert self.get(client, settings, True, params) == self.get(
+                client, settings, False, params
+            ), (
+                'Проверьте, что колоночный движок возвращает те же данные, '
+                f'что и ORM, для запроса {params}.'
+            )
+
+    def test_02_incremental_refresh(self, client, settings, catalog, engine):
+        self.get(client, settings, True, {})
+        assert engine.loaded_at is not None
+
+        title = Title.objects.get(name='Произведение 1')
+        title.year = 2020
+        title.save()
+        TitleGenre.objects.filter(title=title).delete()
+        TitleGenre.objects.create(
+            title=title, genre=Genre.objects.get(slug='comedy')
+        )
+        Title.objects.get(name='Произведение 2').delete()
+        Title.objects.create(name='Новое', year=2020)
+
+        for params in (
+            {'year': 2020}, {'genre': 'comedy'}, {'name': 'произведение 2'},
+            {'ordering': '-year'}
+        ):
+            assert self.get(client, settings, True, params) == self.get(
+                client, settings, False, params
+            ), (
+                'Проверьте, что движок применяет изменения произведений '
+                f'без полной перезагрузки. Запрос: {params}.'
+            )
+
+    def test_03_unsupported_params_use_orm(self, client, settings, catalog,
+                                           engine):
+        data = self.get(client, settings, True, {'search': 'произведение'})
+        assert data['count'] == 45
+        assert engine.loaded_at is None
+
+    def test_04_writes_from_other_process(self, client, settings, catalog,
+                                          engine, monkeypatch):
+        monkeypatch.setattr(engine, 'check_interval', 0)
+        assert self.get(client, settings, True, {'year': 2030})['count'] == 0
+        title = Title.objects.get(name='Произведение 1')
+        other = connection.copy()
+        try:
+            with other.cursor() as cursor:
+                cursor.execute(
+                    'UPDATE reviews_title SET year = 2030 WHERE id = %s',
+                    [title.pk]
+                )
+                cursor.execute(
+                    'INSERT INTO reviews_tableversion ("table", version) '
+                    'VALUES (%s, 1) ON CONFLICT ("table") '
+                    'DO UPDATE SET version = version + 1',
+                    [Title._meta.label_lower]
+                )
+        finally:
+            other.close()
+        data = self.get(client, settings, True, {'year': 2030})
+        assert [obj['id'] for obj in data['results']] == [title.pk], (
+            'Проверьте, что движок сверяет версии таблиц каталога в БД и '
+            'видит изменения из других процессов.'
+        )
+
+    def test_05_zero_year(self, client, settings, catalog):
+        Title.objects.create(name='Античность', year=0)
+        data = self.get(client, settings, True, {'year': 0})
+        assert data == self.get(client, settings, False, {'year': 0}), (
+            'Проверьте, что движок фильтрует по году 0.'
+        )
+        assert data['count'] == 1
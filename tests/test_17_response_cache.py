@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Терминатор', year=1984,
+                                     category=category)
+        TitleGenre.objects.create(title=title, genre=genre)
+        return title
+
+    def get_title(self, client):
+        return client.get(self.TITLES_URL).json()['results'][0]
+
+    def test_01_anonymous_get_is_cached(self, client, title,
+                                        django_assert_num_queries):
+        first = client.get(self.TITLES_URL, {'year': 1984, 'page': 1})
+        with django_assert_num_queries(1):
+            second = client.get(self.TITLES_URL, {'page': 1, 'year': 1984})
+        assert second.content == first.content, (
+            'Проверьте, что повторный анонимный GET-запрос отдаётся из кэша '
+            'одним запросом версий моделей.'
+        )
+        for header in ('Content-Type', 'Vary', 'Allow'):
+            assert second[header] == first[header], (
+                f'Проверьте, что ответ из кэша содержит заголовок `{header}`.'
+            )
+
+    def test_02_authenticated_get_is_not_cached(self, admin_client, title,
+                                                django_assert_max_num_queries):
+        admin_client.get(self.TITLES_URL)
+        with django_assert_max_num_queries(10) as queries:
+            admin_client.get(self.TITLES_URL)
+        assert len(queries) > 0
+
+    def test_03_writes_invalidate(self, client, title, user):
+        assert self.get_title(client)['name'] == 'Терминатор'
+
+        title.name = 'Терминатор 2'
+        title.save()
+        assert self.get_title(client)['name'] == 'Терминатор 2'
+
+        Review.objects.create(title=title, author=user, text='-', score=7)
+        assert self.get_title(client)['rating'] == 7
+
+        Category.objects.filter(slug='films').update(name='Кино')
+        Category.objects.get(slug='films').save()
+        assert self.get_title(client)['category']['name'] == 'Кино'
+
+        Genre.objects.create(name='Комедия', slug='comedy')
+        title.genre.add(Genre.objects.get(slug='comedy'))
+        assert len(self.get_title(client)['genre']) == 2, (
+            'Проверьте, что изменение связанных моделей сбрасывает кэш '
+            'ответов каталога.'
+        )
+
+    def test_04_writes_from_other_process_invalidate(self, client, title):
+        self.get_title(client)
+        other = connection.copy()
+        try:
+            with other.cursor() as cursor:
+                cursor.execute(
+                    'UPDATE reviews_title SET name = %s WHERE id = %s',
+                    ['Без сигнала', title.pk]
+                )
+                cursor.execute(
+                    'INSERT INTO reviews_tableversion ("table", version) '
+                    'VALUES (%s, 1) ON CONFLICT ("table") '
+                    'DO UPDATE SET version = version + 1',
+                    ['reviews.title']
+                )
+        finally:
+            other.close()
+        assert self.get_title(client)['name'] == 'Без сигнала', (
+            'Проверьте, что запись из другого процесса сбрасывает кэш '
+            'ответов: версии моделей должны храниться в БД.'
+        )
+
+    def test_05_host_in_key(self, client, title):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000) for idx in range(10)
+        )
+        first = client.get(self.TITLES_URL, HTTP_HOST='internal.local')
+        second = client.get(
+            self.TITLES_URL, HTTP_HOST='api.example.com', secure=True
+        )
+        assert first.json()['next'].startswith('http://internal.local/')
+        assert second.json()['next'].startswith('https://api.example.com/'), (
+            'Проверьте, что ключ кэша учитывает схему и хост: ответ '
+            'содержит абсолютные ссылки.'
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from api.mixins import ConditionalGetMixin
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ConditionalGet:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def urls(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        ids = {'title_id': titles[0]['id'], 'review_id': reviews[0]['id']}
+        return {
+            'title': f'/api/v1/titles/{ids["title_id"]}/',
+            'reviews': self.REVIEWS_URL_TEMPLATE.format(**ids),
+            'review': self.REVIEW_DETAIL_URL_TEMPLATE.format(**ids),
+            'comments': self.COMMENTS_URL_TEMPLATE.format(**ids),
+            'comment': self.COMMENTS_URL_TEMPLATE.format(**ids)
+            + f'{comments[0]["id"]}/',
+        }
+
+    @pytest.mark.parametrize('name', ('reviews', 'review', 'comments',
+                                      'comment'))
+    def test_01_not_modified(self, client, urls, name,
+                             django_assert_max_num_queries):
+        response = client.get(urls[name])
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+
+        with django_assert_max_num_queries(1):
+            response = client.get(
+                urls[name], HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{urls[name]}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+        response = client.get(
+            urls[name], HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_reviews_change_etag(self, client, urls, admin_client):
+        etag = client.get(urls['reviews'])['ETag']
+        review_etag = client.get(urls['review'])['ETag']
+
+        response = admin_client.patch(
+            urls['review'], data={'text': 'новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(urls['reviews'], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет ETag списка отзывов.'
+        )
+        response = client.get(urls['review'], HTTP_IF_NONE_MATCH=review_etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_comments_change_etag(self, client, urls, moderator_client):
+        etag = client.get(urls['comments'])['ETag']
+        reviews_etag = client.get(urls['reviews'])['ETag']
+
+        moderator_client.post(urls['comments'], data={'text': 'комментарий'})
+        response = client.get(urls['comments'], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев.'
+        )
+        response = client.get(urls['reviews'], HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_04_expand_not_conditional(self, client, urls, admin_client):
+        url = f'{urls["reviews"]}?expand=title'
+        response = client.get(url)
+        assert not response.has_header('ETag'), (
+            'Проверьте, что ответ с `?expand=` не получает ETag: дата '
+            'изменения отзывов не учитывает изменения произведения.'
+        )
+        etag = client.get(urls['reviews'])['ETag']
+
+        response = admin_client.patch(urls['title'], data={'name': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert {
+            review['title'] for review in response.json()['results']
+        } == {'Новое'}
+
+    def test_05_last_modified_required(self):
+        with pytest.raises(ImproperlyConfigured):
+            ConditionalGetMixin().get_last_modified()
@@ -0,0 +1,134 @@
+import pytest
+from django.db import connection
+
+from api.lookups import category_lookup, genre_lookup
+from reviews.models import Category, Genre, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Lookups:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Терминатор', year=1984,
+                                     category=category)
+        TitleGenre.objects.create(title=title, genre=genre)
+        return title
+
+    @pytest.fixture
+    def other_connection(self):
+        """Соединение с той же БД, как у другого процесса."""
+        other = connection.copy()
+        yield other
+        other.close()
+
+    def write_from_other(self, other, model, *statements):
+        with other.cursor() as cursor:
+            for sql, params in statements:
+                cursor.execute(sql, params)
+            cursor.execute(
+                'INSERT INTO reviews_tableversion ("table", version) '
+                'VALUES (%s, 1) ON CONFLICT ("table") '
+                'DO UPDATE SET version = version + 1',
+                [model._meta.label_lower]
+            )
+
+    def test_01_filters_do_not_query_lookups(self, admin_client, title,
+                                             django_assert_num_queries,
+                                             monkeypatch):
+        monkeypatch.setattr(category_lookup, 'check_interval', 60)
+        monkeypatch.setattr(genre_lookup, 'check_interval', 60)
+        category_lookup.ensure_fresh()
+        genre_lookup.ensure_fresh()
+
+        for params in ({'category': 'films'}, {'genre': 'drama'}):
+            with django_assert_num_queries(4) as context:
+                response = admin_client.get(self.TITLES_URL, params)
+            assert response.json()['count'] == 1
+            tables = ' '.join(
+                query['sql'] for query in context.captured_queries
+            )
+            assert 'reviews_category' not in tables, (
+                'Проверьте, что категории берутся из кэша справочника.'
+            )
+            assert 'reviews_genre"' not in tables, (
+                'Проверьте, что жанры берутся из кэша справочника.'
+            )
+
+        response = admin_client.get(self.TITLES_URL, {'genre': 'unknown'})
+        assert response.json()['count'] == 0
+
+    def test_02_writes_invalidate_lookups(self, admin_client, title):
+        assert category_lookup.get_by_slug('films').name == 'Фильм'
+
+        Category.objects.create(name='Книга', slug='books')
+        Genre.objects.create(name='Комедия', slug='comedy')
+        response = admin_client.post(self.TITLES_URL, {
+            'name': 'Война и мир', 'year': 1869,
+            'category': 'books', 'genre': ['comedy']
+        })
+        assert response.status_code == 201, (
+            'Проверьте, что новые категории и жанры сразу доступны для '
+            'создания произведений.'
+        )
+
+        category = Category.objects.get(slug='films')
+        category.name = 'Кино'
+        category.save()
+        response = admin_client.get(f'{self.TITLES_URL}{title.pk}/')
+        assert response.json()['category'] == {'name': 'Кино', 'slug': 'films'}
+
+        Genre.objects.get(slug='comedy').delete()
+        response = admin_client.post(self.TITLES_URL, {
+            'name': 'Ревизор', 'year': 1836,
+            'category': 'books', 'genre': ['comedy']
+        })
+        assert response.status_code == 400
+        assert 'genre' in response.json()
+
+    def test_03_writes_from_other_process(self, admin_client, title,
+                                          other_connection):
+        assert category_lookup.get_by_slug('films') is not None
+        assert genre_lookup.get_by_slug('drama') is not None
+
+        self.write_from_other(other_connection, Category, (
+            'INSERT INTO reviews_category (name, name_key, slug) '
+            'VALUES (%s, %s, %s)', ['Книга', 'книга', 'books']
+        ))
+        self.write_from_other(other_connection, Genre, (
+            'INSERT INTO reviews_genre (name, name_key, slug) '
+            'VALUES (%s, %s, %s)', ['Комедия', 'комедия', 'comedy']
+        ))
+        response = admin_client.post(self.TITLES_URL, {
+            'name': 'Война и мир', 'year': 1869,
+            'category': 'books', 'genre': ['comedy']
+        })
+        assert response.status_code == 201, (
+            'Проверьте, что категории и жанры, созданные другим процессом, '
+            'доступны для создания произведений.'
+        )
+        response = admin_client.get(self.TITLES_URL, {'category': 'books'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что фильтр находит категорию, созданную другим '
+            'процессом.'
+        )
+
+        self.write_from_other(
+            other_connection, Genre,
+            ('DELETE FROM reviews_titlegenre WHERE genre_id = %s',
+             [genre_lookup.get_by_slug('drama').pk]),
+            ('DELETE FROM reviews_genre WHERE slug = %s', ['drama'])
+        )
+        response = admin_client.post(self.TITLES_URL, {
+            'name': 'Ревизор', 'year': 1836,
+            'category': 'books', 'genre': ['drama']
+        })
+        assert response.status_code == 400, (
+            'Проверьте, что жанр, удалённый другим процессом, не находится '
+            'в кэше справочника.'
+        )
+        assert 'genre' in response.json()
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from reviews.models import Category, Genre, Title, TitleGenre, TitleTrigram
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitlesBulkCreate:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def catalog(self):
+        Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+
+    def post(self, client, data):
+        return client.post(self.TITLES_URL, data=json.dumps(data),
+                           content_type='application/json')
+
+    def test_01_bulk_create(self, admin_client, catalog,
+                            django_assert_max_num_queries):
+        data = [
+            {'name': f'Фильм {idx}', 'year': 2000 + idx,
+             'category': 'films',
+             'genre': ['drama', 'comedy'][:idx % 2 + 1]}
+            for idx in range(200)
+        ]
+        # Триграммы вставляются пачками по 333 строки (три столбца при
+        # лимите SQLite в 999 параметров), последний запрос - увеличение
+        # версий произведений и жанров.
+        with django_assert_max_num_queries(17):
+            response = self.post(admin_client, data)
+
+        assert response.status_code == 201, (
+            'Проверьте, что POST-запрос со списком произведений создаёт их.'
+        )
+        result = response.json()
+        assert len(result) == 200
+        assert result[1]['genre'] == ['drama', 'comedy']
+        assert result[0]['category'] == 'films'
+        assert Title.objects.count() == 200
+        assert TitleGenre.objects.count() == 300
+        title = Title.objects.get(pk=result[1]['id'])
+        assert title.name == 'Фильм 1'
+        assert title.name_key == 'фильм 1'
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'drama', 'comedy'
+        }
+        assert TitleTrigram.objects.filter(title=title).exists(), (
+            'Проверьте, что для созданных списком произведений строятся '
+            'триграммы.'
+        )
+
+        response = admin_client.get(self.TITLES_URL, {'genre': 'comedy'})
+        assert response.json()['count'] == 100
+
+    def test_02_bulk_errors(self, admin_client, catalog):
+        data = [
+            {'name': 'Фильм', 'year': 2000, 'category': 'films',
+             'genre': ['drama']},
+            {'name': 'Фильм', 'year': 2000, 'category': 'books',
+             'genre': ['drama']},
+            {'year': 2000, 'category': 'films', 'genre': ['unknown']},
+        ]
+        response = self.post(admin_client, data)
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert len(errors) == 3, (
+            'Проверьте, что ошибки возвращаются для каждого элемента списка.'
+        )
+        assert errors[0] == {}
+        assert set(errors[1]) == {'category'}
+        assert set(errors[2]) == {'name', 'genre'}
+        assert Title.objects.count() == 0, (
+            'Проверьте, что при ошибке не создаётся ни одно произведение.'
+        )
+
+    def test_03_bulk_create_permissions(self, client, user_client, catalog):
+        data = [{'name': 'Фильм', 'year': 2000, 'category': 'films',
+                 'genre': ['drama']}]
+        assert self.post(client, data).status_code == 401
+        assert self.post(user_client, data).status_code == 403
+        assert Title.objects.count() == 0
@@ -0,0 +1,71 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Comment, Review, Title, TitleTrigram
+from users.models import CustomUser
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def count_rows(name):
+    with open(DATA_DIR / f'{name}.csv', encoding='utf-8', newline='') as file:
+        return sum(1 for _ in csv.reader(file)) - 1
+
+
+def get_indexes():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            'AND sql IS NOT NULL'
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21LoadCsv:
+
+    def test_01_load_csv(self, client):
+        indexes = get_indexes()
+        out = StringIO()
+        call_command('load_csv', '--drop-indexes', '--batch-size', '50',
+                     stdout=out)
+
+        assert CustomUser.objects.count() == count_rows('users')
+        assert Title.objects.count() == count_rows('titles')
+        assert Review.objects.count() == count_rows('review')
+        assert Comment.objects.count() == count_rows('comments')
+        assert 'записей/с' in out.getvalue(), (
+            'Проверьте, что команда `load_csv` выводит скорость загрузки.'
+        )
+        assert get_indexes() == indexes, (
+            'Проверьте, что после загрузки индексы пересоздаются.'
+        )
+
+        review = Review.objects.get(pk=1)
+        assert review.author_id == 100
+        assert review.pub_date.isoformat() == (
+            '2019-09-24T21:08:21.567000+00:00'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        scores = list(title.reviews.values_list('score', flat=True))
+        assert title.rating == pytest.approx(sum(scores) / len(scores)), (
+            'Проверьте, что после загрузки пересчитывается рейтинг.'
+        )
+        assert TitleTrigram.objects.filter(title=title).exists()
+        response = client.get('/api/v1/titles/', {'search': 'Шоушенк'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после загрузки перестраивается полнотекстовый '
+            'индекс.'
+        )
+
+    def test_02_reload_with_clear(self):
+        call_command('load_csv', stdout=StringIO())
+        call_command('load_csv', 'review', 'comments', '--clear',
+                     stdout=StringIO())
+        assert Review.objects.count() == count_rows('review')
+        assert Comment.objects.count() == count_rows('comments')
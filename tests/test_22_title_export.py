@@ -0,0 +1,89 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    @pytest.fixture
+    def titles(self, user):
+        category = Category.objects.create(name='Фильм', slug='films')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        titles = [
+            Title.objects.create(name=f'Фильм {idx}', year=2000 + idx,
+                                 category=category if idx % 2 else None)
+            for idx in range(5)
+        ]
+        TitleGenre.objects.create(title=titles[1], genre=drama)
+        TitleGenre.objects.create(title=titles[1], genre=comedy)
+        Review.objects.create(title=titles[1], author=user, text='-',
+                              score=8)
+        return titles
+
+    def get_content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_ndjson(self, admin_client, titles):
+        response = admin_client.get(self.EXPORT_URL)
+
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка каталога отдаётся потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [
+            json.loads(line)
+            for line in self.get_content(response).splitlines()
+        ]
+        assert [row['id'] for row in rows] == [title.pk for title in titles]
+        assert rows[1] == {
+            'id': titles[1].pk, 'name': 'Фильм 1', 'year': 2001,
+            'description': '', 'category': 'films',
+            'genre': ['drama', 'comedy'], 'rating': 8,
+        }
+        assert rows[0]['category'] is None
+        assert rows[0]['genre'] == []
+        assert rows[0]['rating'] is None
+
+    def test_02_export_csv(self, admin_client, titles):
+        response = admin_client.get(self.EXPORT_URL, {'type': 'csv'})
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.DictReader(StringIO(self.get_content(response))))
+        assert len(rows) == len(titles)
+        assert rows[1]['genre'] == 'drama,comedy'
+        assert rows[1]['rating'] == '8'
+
+        response = admin_client.get(self.EXPORT_URL, {'type': 'xml'})
+        assert response.status_code == 400
+
+    def test_03_export_permissions(self, client, user_client,
+                                   moderator_client, titles):
+        assert client.get(self.EXPORT_URL).status_code == 401
+        assert user_client.get(self.EXPORT_URL).status_code == 403
+        assert moderator_client.get(self.EXPORT_URL).status_code == 403
+
+    def test_04_export_command(self, titles, tmp_path):
+        out = StringIO()
+        call_command('export_titles', '--chunk-size', '2', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [row['id'] for row in rows] == [title.pk for title in titles]
+        assert rows[1]['genre'] == ['drama', 'comedy'], (
+            'Проверьте, что команда `export_titles` выгружает жанры для '
+            'каждой пачки.'
+        )
+
+        path = tmp_path / 'titles.csv'
+        call_command('export_titles', '--type', 'csv', '--output', str(path))
+        with open(path, encoding='utf-8', newline='') as file:
+            assert len(list(csv.DictReader(file))) == len(titles)
@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+from reviews.models import Category, Comment, Review, Title
+
+
+def count_selects(queries, table):
+    pattern = re.compile(rf'^SELECT .* FROM "{table}" WHERE')
+    return sum(1 for query in queries if pattern.match(query['sql']))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23IdentityMap:
+
+    @pytest.fixture
+    def title(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        return Title.objects.create(name='Терминатор', year=1984,
+                                    category=category)
+
+    @pytest.fixture
+    def review(self, title, admin):
+        return Review.objects.create(title=title, author=admin, text='-',
+                                     score=5)
+
+    def test_01_review_post_loads_title_once(self, user_client, title,
+                                             django_assert_max_num_queries):
+        with django_assert_max_num_queries(20) as context:
+            response = user_client.post(
+                f'/api/v1/titles/{title.pk}/reviews/',
+                {'text': 'Отлично', 'score': 9}
+            )
+        assert response.status_code == 201
+        assert count_selects(
+            context.captured_queries, 'reviews_title'
+        ) == 1, (
+            'Проверьте, что произведение загружается один раз за запрос.'
+        )
+
+    def test_02_comment_post_loads_review_once(self, user_client, review,
+                                               django_assert_max_num_queries):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/'
+        with django_assert_max_num_queries(20) as context:
+            response = user_client.post(url, {'text': 'Согласен'})
+        assert response.status_code == 201
+        assert count_selects(
+            context.captured_queries, 'reviews_review'
+        ) == 1, 'Проверьте, что отзыв загружается один раз за запрос.'
+
+    def test_03_permission_does_not_load_author(
+            self, admin_client, user, review, django_assert_max_num_queries):
+        comment = Comment.objects.create(review=review, author=user,
+                                         text='Комментарий')
+        url = (f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+               f'comments/{comment.pk}/')
+        with django_assert_max_num_queries(20) as context:
+            response = admin_client.patch(url, {'text': 'Изменено'})
+        assert response.status_code == 200
+        assert response.json()['author'] == user.username
+        assert count_selects(
+            context.captured_queries, 'users_customuser'
+        ) == 1, (
+            'Проверьте, что разрешения сравнивают `author_id` и не '
+            'загружают автора отдельным запросом.'
+        )
+
+    def test_04_missing_parent_returns_404(self, user_client, title):
+        response = user_client.get(f'/api/v1/titles/{title.pk}/reviews/1/'
+                                   'comments/')
+        assert response.status_code == 404
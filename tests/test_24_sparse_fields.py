@@ -0,0 +1,110 @@
+import pytest
+
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def review(self, user, admin):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Терминатор', year=1984,
+                                     category=category,
+                                     description='Длинное описание')
+        TitleGenre.objects.create(title=title, genre=genre)
+        review = Review.objects.create(title=title, author=admin,
+                                       text='Текст отзыва', score=8)
+        Comment.objects.create(review=review, author=user, text='Согласен')
+        return review
+
+    def test_01_title_fields(self, admin_client, review,
+                             django_assert_num_queries):
+        with django_assert_num_queries(3) as context:
+            response = admin_client.get(self.TITLES_URL,
+                                        {'fields': 'id,name,rating'})
+        assert response.json()['results'] == [
+            {'id': review.title_id, 'name': 'Терминатор', 'rating': 8}
+        ], 'Проверьте, что `?fields=` оставляет в ответе только эти поля.'
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert '"description"' not in sql, (
+            'Проверьте, что невыбранные столбцы не загружаются из БД.'
+        )
+        assert 'reviews_titlegenre' not in sql, (
+            'Проверьте, что жанры не загружаются без поля `genre`.'
+        )
+
+        response = admin_client.get(f'{self.TITLES_URL}{review.title_id}/',
+                                    {'fields': 'genre,category'})
+        assert response.json() == {
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+            'category': {'name': 'Фильм', 'slug': 'films'},
+        }
+
+        response = admin_client.get(self.TITLES_URL)
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'year', 'description', 'rating', 'genre',
+            'category'
+        }
+
+    def test_02_cursor_with_fields(self, admin_client, review):
+        response = admin_client.get(self.TITLES_URL, {
+            'fields': 'id', 'ordering': '-year', 'cursor': ''
+        })
+        assert response.status_code == 200
+        assert response.json()['results'] == [{'id': review.title_id}]
+
+    def test_03_comment_expand(self, user_client, review,
+                               django_assert_max_num_queries):
+        url = (f'{self.TITLES_URL}{review.title_id}/reviews/{review.pk}/'
+               'comments/')
+        comment = user_client.get(url).json()['results'][0]
+        assert set(comment) == {'id', 'author', 'text', 'pub_date'}, (
+            'Проверьте, что текст отзыва выводится в комментариях только '
+            'по `?expand=review`.'
+        )
+
+        comment = user_client.get(url, {'expand': 'review'}).json()
+        assert comment['results'][0]['review'] == 'Текст отзыва'
+
+        with django_assert_max_num_queries(10) as context:
+            response = user_client.get(url, {'fields': 'id,text'})
+        assert response.json()['results'][0] == {
+            'id': review.comments.get().pk, 'text': 'Согласен'
+        }
+        comment_query = next(
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_comment"' in query['sql']
+            and 'COUNT' not in query['sql']
+        )
+        assert 'users_customuser' not in comment_query, (
+            'Проверьте, что связь с автором не загружается без поля `author`.'
+        )
+
+    def test_04_review_expand(self, user_client, review):
+        url = f'{self.TITLES_URL}{review.title_id}/reviews/'
+        data = user_client.get(url).json()['results'][0]
+        assert set(data) == {'id', 'author', 'text', 'score', 'pub_date'}
+        data = user_client.get(url, {'expand': 'title',
+                                     'fields': 'title,score'}).json()
+        assert data['results'][0] == {'title': 'Терминатор', 'score': 8}
+
+    def test_05_unknown_fields(self, user_client, review):
+        response = user_client.get(self.TITLES_URL,
+                                   {'fields': 'id,bogus,nope'})
+        assert response.status_code == 400, (
+            'Проверьте, что `?fields=` с неизвестными полями возвращает '
+            'ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'fields': ['Неизвестные поля: bogus, nope.']
+        }
+        url = f'{self.TITLES_URL}{review.title_id}/reviews/'
+        response = user_client.get(url, {'fields': 'title'})
+        assert response.status_code == 200, (
+            'Проверьте, что поля из `expandable_fields` допустимы в '
+            '`?fields=`.'
+        )
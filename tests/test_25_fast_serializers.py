@@ -0,0 +1,90 @@
+import pytest
+from django.test import override_settings
+
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25FastSerializers:
+
+    @pytest.fixture
+    def catalog(self, user, admin, moderator):
+        categories = [
+            Category.objects.create(name='Фильм', slug='films'),
+            Category.objects.create(name='Книга', slug='books'),
+        ]
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        authors = (user, admin, moderator)
+        titles = []
+        for idx in range(15):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=1990 + idx % 4,
+                category=categories[idx % 2] if idx % 5 else None,
+                description='Описание' if idx % 3 else ''
+            )
+            for genre in genres[:idx % 3]:
+                TitleGenre.objects.create(title=title, genre=genre)
+            for author in authors[:idx % 4]:
+                review = Review.objects.create(
+                    title=title, author=author, text=f'Отзыв {idx}',
+                    score=idx % 10 + 1
+                )
+                Comment.objects.create(review=review, author=user,
+                                       text='Комментарий')
+            titles.append(title)
+        return titles
+
+    def get_both(self, client, url, params=None):
+        with override_settings(FAST_SERIALIZERS=False):
+            expected = client.get(url, params)
+        with override_settings(FAST_SERIALIZERS=True):
+            actual = client.get(url, params)
+        assert expected.status_code == actual.status_code == 200
+        return expected.content, actual.content
+
+    @pytest.mark.parametrize('params', (
+        {},
+        {'page': 2},
+        {'genre': 'drama', 'ordering': '-rating'},
+        {'fields': 'id,genre,rating'},
+        {'cursor': '', 'ordering': 'year'},
+        {'cursor': '', 'ordering': '-rating', 'page_size': 4},
+    ))
+    def test_01_titles_identical(self, admin_client, catalog, params):
+        expected, actual = self.get_both(admin_client, '/api/v1/titles/',
+                                         params)
+        assert actual == expected, (
+            'Проверьте, что быстрый путь сериализации произведений отдаёт '
+            'тот же JSON, что и DRF.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {}, {'expand': 'title'}, {'cursor': ''}, {'fields': 'author,text'}
+    ))
+    def test_02_reviews_and_comments_identical(self, admin_client, catalog,
+                                               params):
+        title = catalog[3]
+        review = title.reviews.first()
+        for url in (
+            f'/api/v1/titles/{title.pk}/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+        ):
+            expected, actual = self.get_both(admin_client, url, params)
+            assert actual == expected, (
+                'Проверьте, что быстрый путь сериализации отзывов и '
+                'комментариев отдаёт тот же JSON, что и DRF.'
+            )
+
+    def test_03_cursor_walk(self, admin_client, catalog):
+        url = '/api/v1/titles/'
+        params = {'cursor': '', 'ordering': '-year'}
+        with override_settings(FAST_SERIALIZERS=True):
+            data = admin_client.get(url, params).json()
+            ids = [title['id'] for title in data['results']]
+            while data['next']:
+                data = admin_client.get(data['next']).json()
+                ids.extend(title['id'] for title in data['results'])
+        assert sorted(ids) == sorted(title.pk for title in catalog)
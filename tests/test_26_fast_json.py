@@ -0,0 +1,81 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+DATA = {
+    'id': 1,
+    'name': 'Произведение с разделителем',
+    'pub_date': datetime.datetime(2023, 1, 2, 3, 4, 5, 678901,
+                                  tzinfo=timezone.utc),
+    'local': datetime.datetime(2023, 1, 2, 3, 4, 5),
+    'date': datetime.date(2023, 1, 2),
+    'time': datetime.time(12, 30),
+    'delta': datetime.timedelta(minutes=1),
+    'rating': decimal.Decimal('7.25'),
+    'label': gettext_lazy('Произведение'),
+    'uuid': uuid.UUID(int=1),
+    'genre': ({'slug': 'drama'}, {'slug': 'comedy'}),
+    'scores': {1: 'один', 2: None},
+}
+
+
+class Test26FastJSON:
+
+    def test_01_render_matches_drf(self):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA
+        ), (
+            'Проверьте, что FastJSONRenderer кодирует данные так же, как '
+            'JSONRenderer DRF.'
+        )
+
+    def test_02_render_fallback(self):
+        renderer = FastJSONRenderer()
+        media_type = 'application/json; indent=4'
+        assert renderer.render(DATA, media_type) == JSONRenderer().render(
+            DATA, media_type
+        )
+        assert renderer.render(None) == b''
+        data = {**DATA, 'big': 2 ** 70}
+        assert renderer.render(data) == JSONRenderer().render(data)
+
+    def test_03_render_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA
+        ), 'Проверьте, что без orjson рендерер работает как DRF.'
+
+    @pytest.mark.parametrize('content', (
+        '{"name": "Кино", "year": 2000}',
+        '[{"id": 1}, {"id": 2, "genre": ["drama"]}]',
+        '{"big": 123456789012345678901234567890}',
+    ))
+    def test_04_parse_matches_drf(self, content, monkeypatch):
+        content = content.encode()
+        expected = JSONParser().parse(io.BytesIO(content))
+        assert FastJSONParser().parse(io.BytesIO(content)) == expected
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONParser().parse(io.BytesIO(content)) == expected
+
+    @pytest.mark.parametrize('content', ('{"name": ', '', '[NaN]'))
+    def test_05_parse_errors(self, content):
+        content = content.encode()
+        with pytest.raises(ParseError) as expected:
+            JSONParser().parse(io.BytesIO(content))
+        with pytest.raises(ParseError) as actual:
+            FastJSONParser().parse(io.BytesIO(content))
+        assert str(actual.value) == str(expected.value), (
+            'Проверьте, что FastJSONParser сообщает об ошибках так же, как '
+            'JSONParser DRF.'
+        )
@@ -0,0 +1,87 @@
+import pytest
+
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+msgpack = pytest.importorskip('msgpack')
+
+MSGPACK = 'application/msgpack'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27MessagePack:
+
+    @pytest.fixture
+    def review(self, user, admin):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Терминатор', year=1984,
+                                     category=category,
+                                     description='Длинное описание')
+        TitleGenre.objects.create(title=title, genre=genre)
+        review = Review.objects.create(title=title, author=admin,
+                                       text='Текст отзыва', score=8)
+        Comment.objects.create(review=review, author=user, text='Согласен')
+        return review
+
+    def test_01_same_structure_as_json(self, admin_client, review):
+        base = f'/api/v1/titles/{review.title_id}/'
+        for url in (
+            '/api/v1/titles/',
+            base,
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            f'{base}reviews/',
+            f'{base}reviews/{review.pk}/comments/',
+            '/api/v1/users/',
+            '/api/v1/users/me/',
+        ):
+            expected = admin_client.get(url).json()
+            response = admin_client.get(url, HTTP_ACCEPT=MSGPACK)
+            assert response.status_code == 200
+            assert response['Content-Type'] == MSGPACK, (
+                'Проверьте, что API отдаёт MessagePack по заголовку Accept.'
+            )
+            assert msgpack.unpackb(response.content) == expected, (
+                f'Проверьте, что ответ {url} в MessagePack совпадает по '
+                'структуре с JSON.'
+            )
+        response = admin_client.get('/api/v1/titles/', {'format': 'msgpack'})
+        assert response['Content-Type'] == MSGPACK
+
+    def test_02_parse_request(self, admin_client, review):
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data=msgpack.packb({'name': 'Книга', 'slug': 'books'}),
+            content_type=MSGPACK, HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что API принимает тело запроса в MessagePack.'
+        )
+        assert msgpack.unpackb(response.content) == {
+            'name': 'Книга', 'slug': 'books'
+        }
+        response = admin_client.post(
+            '/api/v1/titles/',
+            data=msgpack.packb([
+                {'name': 'Дюна', 'year': 1965, 'category': 'books',
+                 'genre': ['drama']},
+            ]),
+            content_type=MSGPACK
+        )
+        assert response.status_code == 201, response.json()
+        assert response.json()[0]['genre'] == ['drama']
+
+    def test_03_errors(self, admin_client, review):
+        response = admin_client.post(
+            '/api/v1/categories/', data=b'\xc1', content_type=MSGPACK,
+            HTTP_ACCEPT=MSGPACK
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный MessagePack даёт ответ 400.'
+        )
+        assert 'MessagePack parse error' in (
+            msgpack.unpackb(response.content)['detail']
+        )
+        response = admin_client.get('/api/v1/titles/0/', HTTP_ACCEPT=MSGPACK)
+        assert response.status_code == 404
+        assert 'detail' in msgpack.unpackb(response.content)
@@ -0,0 +1,100 @@
+from contextlib import ExitStack
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from api.rows import get_row_plan
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from reviews.models import Category, Comment, Genre, Review, Title, TitleGenre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28RowReads:
+
+    @pytest.fixture
+    def catalog(self, user, admin, moderator):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        titles = []
+        for idx in range(12):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000 + idx % 3,
+                category=category if idx % 4 else None
+            )
+            for genre in genres[:idx % 3]:
+                TitleGenre.objects.create(title=title, genre=genre)
+            for author in (user, admin, moderator)[:idx % 4]:
+                review = Review.objects.create(
+                    title=title, author=author, text=f'Отзыв {idx}',
+                    score=idx % 10 + 1
+                )
+                Comment.objects.create(review=review, author=user,
+                                       text='Комментарий')
+            titles.append(title)
+        return titles
+
+    def get_both(self, client, url, params, model):
+        with override_settings(ROW_READS=False):
+            expected = client.get(url, params)
+        with override_settings(ROW_READS=True), ExitStack() as stack:
+            stack.enter_context(mock.patch.object(
+                model, 'from_db', side_effect=AssertionError(
+                    'Проверьте, что списки не создают экземпляры моделей.'
+                )
+            ))
+            actual = client.get(url, params)
+        assert expected.status_code == actual.status_code == 200
+        return expected.content, actual.content
+
+    def test_01_plans(self):
+        for serializer in (TitleReadSerializer(), ReviewSerializer(),
+                           CommentSerializer()):
+            assert get_row_plan(serializer) is not None, (
+                'Проверьте, что сериализаторы чтения работают со строками.'
+            )
+
+    @pytest.mark.parametrize('params', (
+        {},
+        {'page': 2, 'ordering': '-rating'},
+        {'fields': 'id,genre'},
+        {'cursor': '', 'ordering': '-year', 'page_size': 5},
+    ))
+    def test_02_titles_identical(self, admin_client, catalog, params):
+        expected, actual = self.get_both(admin_client, '/api/v1/titles/',
+                                         params, Title)
+        assert actual == expected, (
+            'Проверьте, что ответ по строкам совпадает с обычным.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {}, {'expand': 'title'}, {'cursor': ''}
+    ))
+    def test_03_reviews_comments_identical(self, admin_client, catalog,
+                                           params):
+        title = catalog[3]
+        review = title.reviews.first()
+        for url, model in (
+            (f'/api/v1/titles/{title.pk}/reviews/', Review),
+            (f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+             Comment),
+        ):
+            expected, actual = self.get_both(admin_client, url, params,
+                                             model)
+            assert actual == expected, (
+                'Проверьте, что ответ по строкам совпадает с обычным.'
+            )
+
+    def test_04_row_slots(self, catalog):
+        plan = get_row_plan(ReviewSerializer(context={'expand': {'title'}}))
+        row = plan.values(Review.objects.order_by('pk'))[0]
+        assert not hasattr(row, '__dict__'), (
+            'Проверьте, что строки хранят атрибуты в `__slots__`.'
+        )
+        review = Review.objects.order_by('pk').first()
+        assert row.author.username == review.author.username
+        assert row.title.name == review.title.name
@@ -0,0 +1,48 @@
+import pytest
+from django.test import Client, override_settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29LeanMiddleware:
+
+    def test_01_api_skips_session_stack(self, client, admin_client):
+        response = client.get('/api/v1/categories/')
+        assert response.status_code == 200
+        assert not hasattr(response.wsgi_request, 'session'), (
+            'Проверьте, что запросы к API не загружают сессию.'
+        )
+        assert 'X-Frame-Options' not in response, (
+            'Проверьте, что ответы API не проходят XFrameOptionsMiddleware.'
+        )
+        assert not response.cookies
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что API с JWT работает без сессий и CSRF.'
+        )
+
+    def test_02_admin_keeps_full_stack(self, client):
+        response = client.get('/admin/login/')
+        assert response.status_code == 200
+        assert hasattr(response.wsgi_request, 'session')
+        assert response['X-Frame-Options'] == 'DENY', (
+            'Проверьте, что админка проходит полный набор middleware.'
+        )
+        assert 'csrftoken' in response.cookies
+
+        response = Client(enforce_csrf_checks=True).post(
+            '/admin/login/', {'username': 'admin', 'password': 'admin'}
+        )
+        assert response.status_code == 403, (
+            'Проверьте, что админка по-прежнему проверяет CSRF.'
+        )
+
+    def test_03_setting(self):
+        with override_settings(LEAN_MIDDLEWARE_PATHS=()):
+            response = Client().get('/api/v1/categories/')
+        assert response['X-Frame-Options'] == 'DENY', (
+            'Проверьте, что пустой LEAN_MIDDLEWARE_PATHS включает полный '
+            'набор middleware для API.'
+        )
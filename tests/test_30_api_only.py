@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+CODE = '''
+import json
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+from django.urls import Resolver404, resolve
+
+get_wsgi_application()
+resolve('/api/v1/titles/')
+try:
+    resolve('/admin/')
+    admin_url = True
+except Resolver404:
+    admin_url = False
+print(json.dumps({
+    'apps': [app.name for app in apps.get_app_configs()],
+    'middleware': settings.MIDDLEWARE,
+    'modules': [
+        name for name in ('import_export', 'openpyxl', 'numpy',
+                          'reviews.admin')
+        if name in sys.modules
+    ],
+    'admin_url': admin_url,
+}))
+'''
+
+
+def run(api_only):
+    env = {
+        **os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+        'SECRET_KEY': 'test', 'API_ONLY': str(api_only).lower(),
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', CODE], cwd=PROJECT_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+class Test30ApiOnly:
+
+    def test_01_api_only_profile(self):
+        state = run(api_only=True)
+        for app in ('django.contrib.admin', 'django.contrib.sessions',
+                    'django.contrib.messages', 'import_export'):
+            assert app not in state['apps'], (
+                f'Проверьте, что профиль API_ONLY не устанавливает {app}.'
+            )
+        assert state['modules'] == [], (
+            'Проверьте, что в профиле API_ONLY при запуске не импортируются '
+            'админка, import_export и NumPy.'
+        )
+        assert not state['admin_url']
+        assert not any(
+            'session' in name.lower() or 'csrf' in name.lower()
+            for name in state['middleware']
+        )
+
+    def test_02_full_profile(self):
+        state = run(api_only=False)
+        assert 'django.contrib.admin' in state['apps']
+        assert 'import_export' in state['apps']
+        assert state['admin_url'], (
+            'Проверьте, что без API_ONLY админка доступна.'
+        )
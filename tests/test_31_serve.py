@@ -0,0 +1,122 @@
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.error import URLError
+from urllib.request import urlopen
+
+import pytest
+
+from api import warmup
+from api.management.commands import serve
+from api.lookups import category_lookup, genre_lookup
+from reviews.models import Category, Genre
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+CODE = '''
+import sys
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+
+settings.DATABASES['default']['NAME'] = sys.argv[1]
+django.setup()
+call_command('migrate', verbosity=0)
+call_command('serve', bind=sys.argv[2], workers=2, stats_interval=0)
+'''
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urlopen(url, timeout=5) as response:
+                return response.status
+        except (URLError, ConnectionError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31Serve:
+
+    def test_01_warm_up(self, monkeypatch):
+        urls = []
+        monkeypatch.setattr(
+            warmup, 'request',
+            lambda application, url: urls.append(url)
+        )
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        category_lookup.clear()
+        genre_lookup.clear()
+        warmup.warm_up(application=None)
+        assert urls == list(warmup.WARM_UP_URLS)
+        assert (
+            'movie' in category_lookup.by_slug
+            and 'drama' in genre_lookup.by_slug
+        ), (
+            'Проверьте, что прогрев загружает справочники категорий и жанров.'
+        )
+
+    @pytest.mark.skipif(
+        serve.BaseApplication is None, reason='нужен gunicorn'
+    )
+    def test_02_serve(self, tmp_path):
+        port = get_free_port()
+        env = {
+            **os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+            'SECRET_KEY': 'test',
+        }
+        process = subprocess.Popen(
+            [sys.executable, '-c', CODE, str(tmp_path / 'db.sqlite3'),
+             f'127.0.0.1:{port}'],
+            cwd=PROJECT_DIR, env=env, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, text=True
+        )
+        try:
+            status = wait_for(f'http://127.0.0.1:{port}/api/v1/categories/')
+            assert status == 200, (
+                'Проверьте, что команда `serve` обслуживает запросы к API.'
+            )
+            time.sleep(1.5)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            stdout, stderr = process.communicate(timeout=30)
+        assert process.returncode == 0, stderr
+        workers = [
+            line for line in stdout.splitlines()
+            if line.startswith('воркер') and 'RSS' in line
+        ]
+        assert len(workers) == 2, (
+            'Проверьте, что команда `serve` сообщает память каждого воркера.'
+        )
+        assert 'Сервер остановлен' in stdout
+
+    def test_03_report_skips_finished_workers(self):
+        command = serve.Command(stdout=io.StringIO())
+        server = SimpleNamespace(
+            WORKERS={2 ** 22 + 1: None, os.getpid(): None}
+        )
+        command.report(server)
+        lines = command.stdout.getvalue().splitlines()
+        assert any(
+            line.startswith(f'воркер {os.getpid()}:') for line in lines
+        ), (
+            'Проверьте, что отчёт о памяти продолжается после воркера, '
+            'который уже завершился.'
+        )
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+def connect(path):
+    wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': path})
+    wrapper.connect()
+    return wrapper
+
+
+def get_pragma(wrapper, name):
+    return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32Sqlite:
+
+    def test_01_pragmas(self, tmp_path):
+        wrapper = connect(str(tmp_path / 'db.sqlite3'))
+        try:
+            assert get_pragma(wrapper, 'journal_mode') == 'wal', (
+                'Проверьте, что соединения с SQLite используют журнал WAL.'
+            )
+            assert get_pragma(wrapper, 'busy_timeout') == 5000
+            # NORMAL
+            assert get_pragma(wrapper, 'synchronous') == 1
+            # MEMORY
+            assert get_pragma(wrapper, 'temp_store') == 2
+            assert get_pragma(wrapper, 'cache_size') == -64 * 1024
+        finally:
+            wrapper.close()
+
+    def test_02_pragmas_not_in_queries(self, tmp_path):
+        wrapper = DatabaseWrapper({
+            **connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')
+        })
+        wrapper.force_debug_cursor = True
+        try:
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            assert len(wrapper.queries) == 1, (
+                'Проверьте, что PRAGMA не учитываются в запросах соединения.'
+            )
+        finally:
+            wrapper.close()
+
+    def test_03_reader_does_not_block_writer(self, tmp_path):
+        path = str(tmp_path / 'db.sqlite3')
+        reader, writer = connect(path), connect(path)
+        try:
+            writer.connection.execute('CREATE TABLE item (id integer)')
+            reader.connection.execute('BEGIN')
+            reader.connection.execute('SELECT * FROM item').fetchall()
+            start = time.perf_counter()
+            writer.connection.execute('INSERT INTO item VALUES (1)')
+            assert time.perf_counter() - start < 1, (
+                'Проверьте, что открытая транзакция чтения не блокирует '
+                'запись в SQLite.'
+            )
+            assert reader.connection.execute(
+                'SELECT count(*) FROM item'
+            ).fetchone()[0] == 0
+            reader.connection.execute('COMMIT')
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_04_persistent_connections(self, settings):
+        assert settings.DATABASES['default']['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что соединения с БД переиспользуются между '
+            'запросами (CONN_MAX_AGE).'
+        )